@@ -49,6 +49,12 @@ def get_correct_answer(id_: _types.PartId | _solvers.SolverId) -> AnswerType | N
     return _read_correct_answers().get(id_)
 
 
+def get_part_ids_for_known_answers_for_one_year(
+    year: _types.Year,
+) -> Iterator[_types.PartId]:
+    yield from (id_ for id_ in _read_correct_answers() if id_.year == year)
+
+
 def get_part_ids_for_known_answers_for_one_day(
     year: _types.Year, day: _types.Day
 ) -> Iterator[_types.PartId]:
@@ -0,0 +1,38 @@
+import statistics
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+@dataclass(frozen=True)
+class DurationStats:
+    count: int
+    min: float
+    median: float
+    mean: float
+    stddev: float
+    p95: float
+
+    @classmethod
+    def from_durations(cls, durations: Sequence[float]) -> DurationStats:
+        if not durations:
+            raise ValueError(durations)
+        if len(durations) == 1:
+            (duration,) = durations
+            return cls(1, duration, duration, duration, 0.0, duration)
+        return cls(
+            len(durations),
+            min(durations),
+            statistics.median(durations),
+            statistics.fmean(durations),
+            statistics.stdev(durations),
+            statistics.quantiles(durations, n=20, method="inclusive")[18],
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"min {self.min:.3f}s median {self.median:.3f}s mean {self.mean:.3f}s "
+            f"stddev {self.stddev:.3f}s p95 {self.p95:.3f}s"
+        )
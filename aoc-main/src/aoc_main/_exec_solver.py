@@ -2,11 +2,26 @@ import asyncio
 import os
 import shutil
 import subprocess
+import threading
 import time
 import typing
 from dataclasses import dataclass
 
-from aoc_main import _answers, _inputs, _logging, _solvers, _types
+from aoc_main import (
+    _answers,
+    _inputs,
+    _logging,
+    _phases,
+    _resource_usage,
+    _result_cache,
+    _scheduler,
+    _solvers,
+    _types,
+)
+
+if typing.TYPE_CHECKING:
+    import pathlib
+    import resource
 
 _logger = _logging.logger
 
@@ -17,42 +32,146 @@ class SolverExecResult:
     answer: _answers.AnswerType
     duration: float
     logs: list[str] | None
+    resources: _resource_usage.ResourceUsage | None = None
+    profile_file: pathlib.Path | None = None
+    phases: _phases.PhaseTimings | None = None
+    cached: bool = False
+
+
+@dataclass(frozen=True)
+class SolverExecOptions:
+    verbosity: _types.Verbosity
+    dry_run: bool
+    capture_stderr: bool
+    cpu: int | None = None
+    cpu_count: int | None = None
+    use_cache: bool = False
+    profiler: str | None = None
+    record_phases: bool = False
+
+
+@dataclass
+class SolverRunOutput:
+    answer: str
+    duration: float
+    logs: list[str] | None
+    resources: _resource_usage.ResourceUsage | None = None
+    profile_file: pathlib.Path | None = None
+    phases: _phases.PhaseTimings | None = None
 
 
 async def exec_solver(
     id_: _solvers.SolverId,
-    info: _SolverExecInfo,
-    verbosity: _types.Verbosity,
-    *,
-    dry_run: bool,
-    capture_stderr: bool,
+    info: _SolverExecInfo | _SolverWorkerExecInfo,
+    options: SolverExecOptions,
 ) -> SolverExecResult:
+    cache_key = None
+    # Profiled runs are for their profile or phases, which a cached result would
+    # not have
+    if (
+        options.use_cache
+        and not options.dry_run
+        and options.profiler is None
+        and not options.record_phases
+    ):
+        cache_key = _result_cache.compute_key(
+            id_, info.source_files, _inputs.get_input_file_path(id_.year, id_.day)
+        )
+        cached = _result_cache.lookup(cache_key)
+        if cached is not None:
+            _logger.debug("%s: Using cached result: %s", id_, cache_key)
+            return SolverExecResult(
+                id_,
+                _parse_answer(cached.answer),
+                cached.duration,
+                [] if options.capture_stderr else None,
+                cached=True,
+            )
+
+    if isinstance(info, _SolverWorkerExecInfo):
+        output = await _exec_in_worker(id_, info, options)
+    else:
+        output = await _exec_in_process(id_, info, options)
+
+    answer = _parse_answer(output.answer)
+    if cache_key is not None and answer == _answers.get_correct_answer(id_):
+        # Only verified answers are cached so that a wrong answer is always
+        # reproduced by actually running the solver.
+        _result_cache.store(
+            cache_key, _result_cache.CachedResult(output.answer, output.duration)
+        )
+    return SolverExecResult(
+        id_,
+        answer,
+        output.duration,
+        output.logs,
+        output.resources,
+        output.profile_file,
+        output.phases,
+    )
+
+
+def _parse_answer(answer_raw: str) -> _answers.AnswerType:
+    try:
+        return _answers.AnswerIntType(int(answer_raw))
+    except ValueError:
+        return _answers.AnswerStrType(answer_raw)
+
+
+async def _exec_in_worker(
+    id_: _solvers.SolverId,
+    info: _SolverWorkerExecInfo,
+    options: SolverExecOptions,
+) -> SolverRunOutput:
+    if options.dry_run:
+        _logger.info("%s: Would run in worker", id_)
+        return SolverRunOutput("0", 0.0, [] if options.capture_stderr else None)
+
+    input_str = _inputs.get_input_file_path(id_.year, id_.day).read_text()
+    return await info.run_in_worker(id_, input_str, options)
+
+
+async def _exec_in_process(
+    id_: _solvers.SolverId,
+    info: _SolverExecInfo,
+    options: SolverExecOptions,
+) -> SolverRunOutput:
     input_file_path = _inputs.get_input_file_path(id_.year, id_.day)
 
+    if options.profiler is not None:
+        _logger.warning("%s: Profiling is only supported for Python solvers", id_)
+
     args = info.run_args[:]
-    args.extend([str(verbosity), str(id_.part)])
-    if dry_run:
+    args.extend([str(options.verbosity), str(id_.part)])
+    if options.dry_run:
         args.insert(0, "echo")
 
     working_directory = _solvers.get_solver_root_dir(id_.solver)
 
     env = os.environ.copy()
+    if options.record_phases:
+        env[_phases.ENV_PHASES] = "1"
+    if options.cpu_count is not None:
+        env[_scheduler.ENV_SOLVER_CPUS] = str(options.cpu_count)
     info.adjust_run_environment(env)
 
     with input_file_path.open() as f:
         _logger.debug("Launching solver: '%s'", " ".join(args))
         _logger.debug("Working directory: %s", working_directory)
         start_time = time.perf_counter()
-        proc = await asyncio.subprocess.create_subprocess_exec(
-            *args,
+        proc = _spawn(
+            args,
             cwd=working_directory,
             env=env,
             stdin=f,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE if capture_stderr else None,
+            capture_stderr=options.capture_stderr,
         )
-        stdout_raw, stderr_raw = await proc.communicate()
-    duration = time.perf_counter() - start_time
+    _scheduler.pin_to_cpu(proc.pid, options.cpu)
+    stdout_raw, stderr_raw, (proc.returncode, end_time, rusage) = await asyncio.gather(
+        _read_pipe(proc.stdout), _read_pipe(proc.stderr), _wait4(proc.pid)
+    )
+    duration = end_time - start_time
+    assert stdout_raw is not None
 
     assert proc.returncode is not None
     _logger.debug("%s: Return code: %d", id_, proc.returncode)
@@ -64,7 +183,7 @@ async def exec_solver(
     if proc.returncode != 0:
         raise _SolverExecError(id_, proc.returncode, stdout, stderr)
 
-    if dry_run:
+    if options.dry_run:
         answer_raw = "0"
     else:
         output_lines = stdout.splitlines()
@@ -72,25 +191,94 @@ async def exec_solver(
         output_line = output_lines[0]
         (answer_raw,) = output_line.split()
 
-    answer: _answers.AnswerType
-    try:
-        answer = _answers.AnswerIntType(int(answer_raw))
-    except ValueError:
-        answer = _answers.AnswerStrType(answer_raw)
     logs = None
-    if capture_stderr:
+    phases = None
+    if options.capture_stderr:
         assert stderr is not None
-        logs = stderr.splitlines()
-    return SolverExecResult(id_, answer, duration, logs)
+        logs, phases = _phases.split_phases_from_stderr(stderr.splitlines())
+    return SolverRunOutput(
+        answer_raw,
+        duration,
+        logs,
+        _resource_usage.ResourceUsage.from_rusage(rusage),
+        phases=phases,
+    )
+
+
+def _spawn(
+    args: list[str],
+    *,
+    cwd: pathlib.Path,
+    env: dict[str, str],
+    stdin: typing.IO[str],
+    capture_stderr: bool,
+) -> subprocess.Popen[bytes]:
+    # Not an asyncio subprocess as the event loop's child watcher would reap the
+    # process and discard its resource usage. _wait4 reaps it instead.
+    return subprocess.Popen(  # noqa: S603
+        args,
+        cwd=cwd,
+        env=env,
+        stdin=stdin,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE if capture_stderr else None,
+    )
+
+
+async def _read_pipe(pipe: typing.IO[bytes] | None) -> bytes | None:
+    if pipe is None:
+        return None
+    reader = asyncio.StreamReader()
+    await asyncio.get_running_loop().connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), pipe
+    )
+    return await reader.read()
+
+
+async def _wait4(pid: int) -> tuple[int, float, resource.struct_rusage]:
+    """Wait for a child process to exit in a dedicated thread.
+
+    Returns the exit code, the time of exit and the resource usage of the child.
+    """
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future[tuple[int, float, resource.struct_rusage]] = (
+        loop.create_future()
+    )
+
+    def wait() -> None:
+        try:
+            _, status, rusage = os.wait4(pid, 0)
+        except OSError as e:
+            loop.call_soon_threadsafe(future.set_exception, e)
+            return
+        end_time = time.perf_counter()
+        result = (os.waitstatus_to_exitcode(status), end_time, rusage)
+        loop.call_soon_threadsafe(future.set_result, result)
+
+    threading.Thread(target=wait, name=f"wait4-{pid}", daemon=True).start()
+    return await future
 
 
 class _SolverExecInfo(typing.Protocol):
+    @property
+    def source_files(self) -> list[pathlib.Path]: ...
+
     @property
     def run_args(self) -> list[str]: ...
 
     def adjust_run_environment(self, env: dict[str, str]) -> None: ...
 
 
+@typing.runtime_checkable
+class _SolverWorkerExecInfo(typing.Protocol):
+    @property
+    def source_files(self) -> list[pathlib.Path]: ...
+
+    async def run_in_worker(
+        self, id_: _solvers.SolverId, input_str: str, options: SolverExecOptions
+    ) -> SolverRunOutput: ...
+
+
 class _SolverExecError(_solvers.SolverError):
     def __init__(
         self, id_: _solvers.SolverId, returncode: int, stdout: str, stderr: str | None
@@ -0,0 +1,235 @@
+import asyncio
+import datetime
+import json
+import platform
+import statistics
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Protocol
+
+from aoc_main import _answers, _logging, _solvers, _types, _utils
+
+if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Iterable
+
+_logger = _logging.logger
+
+# Differences below this are timer and scheduling noise for even the fastest
+# solvers, so they are never reported as regressions.
+_MIN_REGRESSION_SECONDS = 0.01
+
+
+@dataclass(frozen=True)
+class HistoryEntry:
+    timestamp: str
+    year: int
+    day: int
+    part: int
+    solver: str
+    answer: str
+    duration: float
+    commit: str | None
+    dirty: bool
+    machine: str
+
+    @property
+    def solver_id(self) -> _solvers.SolverId:
+        assert _types.is_part(self.part)
+        return _solvers.SolverId(
+            _types.Year(self.year),
+            _types.Day(self.day),
+            self.part,
+            _solvers.Solver(self.solver),
+        )
+
+    @property
+    def revision(self) -> str | None:
+        if self.commit is None:
+            return None
+        return f"{self.commit}-dirty" if self.dirty else self.commit
+
+
+class _Result(Protocol):
+    @property
+    def id_(self) -> _solvers.SolverId: ...
+    @property
+    def answer(self) -> _answers.AnswerType: ...
+    @property
+    def duration(self) -> float: ...
+
+
+def _get_history_file_path() -> pathlib.Path:
+    return _utils.get_state_dir() / "history.jsonl"
+
+
+def _get_machine_id() -> str:
+    return f"{platform.node()}-{platform.machine()}"
+
+
+async def _git(*args: str) -> str | None:
+    proc = await asyncio.subprocess.create_subprocess_exec(
+        "git",
+        *args,
+        cwd=_utils.get_repo_root(),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    stdout, _ = await proc.communicate()
+    if proc.returncode != 0:
+        return None
+    return stdout.decode().strip()
+
+
+async def _get_git_state() -> tuple[str | None, bool]:
+    commit, status = await asyncio.gather(
+        _git("rev-parse", "HEAD"),
+        _git("status", "--porcelain", "--untracked-files=no"),
+    )
+    return commit, bool(status)
+
+
+def read_history() -> list[HistoryEntry]:
+    """Return the recorded entries of this machine, oldest first."""
+    path = _get_history_file_path()
+    if not path.exists():
+        return []
+    machine = _get_machine_id()
+    entries: list[HistoryEntry] = []
+    with path.open() as f:
+        for line_number, line in enumerate(f, 1):
+            try:
+                entry = HistoryEntry(**json.loads(line))
+            except json.JSONDecodeError, TypeError:
+                _logger.warning(
+                    "Ignoring malformed history entry: %s:%d", path, line_number
+                )
+                continue
+            if entry.machine == machine:
+                entries.append(entry)
+    return entries
+
+
+async def record_results(results: Iterable[_Result]) -> None:
+    commit, dirty = await _get_git_state()
+    timestamp = datetime.datetime.now(tz=datetime.UTC).isoformat()
+    machine = _get_machine_id()
+    lines = [
+        json.dumps(
+            asdict(
+                HistoryEntry(
+                    timestamp,
+                    result.id_.year,
+                    result.id_.day,
+                    result.id_.part,
+                    str(result.id_.solver),
+                    str(result.answer),
+                    result.duration,
+                    commit,
+                    dirty,
+                    machine,
+                )
+            )
+        )
+        + "\n"
+        for result in results
+    ]
+    with _get_history_file_path().open("a") as f:
+        f.writelines(lines)
+
+
+def _group_by_solver(
+    entries: Iterable[HistoryEntry],
+) -> dict[_solvers.SolverId, list[HistoryEntry]]:
+    entries_by_solver: dict[_solvers.SolverId, list[HistoryEntry]] = defaultdict(list)
+    for entry in entries:
+        entries_by_solver[entry.solver_id].append(entry)
+    return entries_by_solver
+
+
+def _median_duration(entries: Iterable[HistoryEntry]) -> float:
+    return statistics.median(entry.duration for entry in entries)
+
+
+def _latest_revision_entries(entries: list[HistoryEntry]) -> list[HistoryEntry]:
+    revision = entries[-1].revision
+    return [entry for entry in entries if entry.revision == revision]
+
+
+def read_expected_durations() -> dict[_solvers.SolverId, float]:
+    """Return the median duration of each solver at its latest recorded revision."""
+    return {
+        id_: _median_duration(_latest_revision_entries(entries))
+        for id_, entries in _group_by_solver(read_history()).items()
+    }
+
+
+@dataclass(frozen=True)
+class DurationComparison:
+    id: _solvers.SolverId
+    current: float
+    current_revision: str | None
+    baseline: float
+    baseline_revision: str | None
+
+    @property
+    def change(self) -> float:
+        """Relative change of the duration, e.g. 0.25 for 25 % slower."""
+        return self.current / self.baseline - 1
+
+    def is_regression(self, threshold: float) -> bool:
+        return (
+            self.change > threshold
+            and self.current - self.baseline > _MIN_REGRESSION_SECONDS
+        )
+
+
+def _baseline_entries(
+    entries: list[HistoryEntry],
+    current_revision: str | None,
+    baseline_commit: str | None,
+) -> list[HistoryEntry]:
+    if baseline_commit is not None:
+        return [
+            entry
+            for entry in entries
+            if entry.commit is not None
+            and entry.commit.startswith(baseline_commit)
+            and entry.revision != current_revision
+        ]
+
+    # Without an explicit baseline, compare against the most recent other revision
+    previous = next(
+        (entry for entry in reversed(entries) if entry.revision != current_revision),
+        None,
+    )
+    if previous is None:
+        return []
+    return [entry for entry in entries if entry.revision == previous.revision]
+
+
+def compare_durations(
+    entries: Iterable[HistoryEntry], baseline_commit: str | None = None
+) -> list[DurationComparison]:
+    """Compare the latest revision of each solver against a baseline revision.
+
+    Median durations are compared so that single noisy runs do not dominate.
+    Solvers without entries for a baseline revision are left out.
+    """
+    comparisons: list[DurationComparison] = []
+    for id_, solver_entries in _group_by_solver(entries).items():
+        current = _latest_revision_entries(solver_entries)
+        current_revision = current[0].revision
+        baseline = _baseline_entries(solver_entries, current_revision, baseline_commit)
+        if not baseline:
+            continue
+        comparisons.append(
+            DurationComparison(
+                id_,
+                _median_duration(current),
+                current_revision,
+                _median_duration(baseline),
+                baseline[0].revision,
+            )
+        )
+    return comparisons
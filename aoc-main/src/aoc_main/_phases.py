@@ -0,0 +1,81 @@
+import json
+import statistics
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from aoc_main import _logging
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+_logger = _logging.logger
+
+# Solvers report their phases on stderr as one line with this prefix followed by
+# a JSON object: {"durations": {"name": seconds}, "counters": {"name": count}}
+PHASES_LINE_PREFIX = "aoc-phases: "
+
+# Set for solvers that are launched as their own process to report their phases
+ENV_PHASES = "AOC_PHASES"
+
+
+@dataclass(frozen=True)
+class PhaseTimings:
+    durations: dict[str, float]
+    counters: dict[str, int]
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PhaseTimings:
+        return cls(
+            {name: float(duration) for name, duration in data["durations"].items()},
+            {name: int(count) for name, count in data["counters"].items()},
+        )
+
+    @classmethod
+    def median_of(cls, timings: Sequence[PhaseTimings]) -> PhaseTimings:
+        """Median of each phase and counter over runs, e.g. of a benchmark."""
+        assert timings
+        return cls(
+            {
+                name: statistics.median(t.durations.get(name, 0.0) for t in timings)
+                for name in _names(t.durations for t in timings)
+            },
+            {
+                name: round(statistics.median(t.counters.get(name, 0) for t in timings))
+                for name in _names(t.counters for t in timings)
+            },
+        )
+
+    def report_lines(self, total_duration: float) -> list[str]:
+        lines = [
+            f"{name}: {duration:.3f}s ({duration / total_duration:.0%})"
+            if total_duration > 0
+            else f"{name}: {duration:.3f}s"
+            for name, duration in self.durations.items()
+        ]
+        lines.extend(f"{name}: {count}" for name, count in self.counters.items())
+        return lines
+
+
+def _names(dicts: Iterable[dict[str, Any]]) -> list[str]:
+    # Keep the order in which the phases were first entered
+    return list(dict.fromkeys(name for d in dicts for name in d))
+
+
+def split_phases_from_stderr(
+    lines: Iterable[str],
+) -> tuple[list[str], PhaseTimings | None]:
+    """Separate the phases line of a solver from its other stderr lines."""
+    other_lines: list[str] = []
+    timings = None
+    for line in lines:
+        if not line.startswith(PHASES_LINE_PREFIX):
+            other_lines.append(line)
+            continue
+        try:
+            timings = PhaseTimings.from_dict(
+                json.loads(line.removeprefix(PHASES_LINE_PREFIX))
+            )
+        except json.JSONDecodeError, KeyError, AttributeError, ValueError:
+            _logger.warning("Ignoring malformed phases line: %s", line)
+            other_lines.append(line)
+    return other_lines, timings
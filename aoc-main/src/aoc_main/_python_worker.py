@@ -0,0 +1,183 @@
+import asyncio
+import json
+import pathlib
+import shutil
+from typing import Any
+
+from aoc_main import (
+    _exec_solver,
+    _logging,
+    _phases,
+    _resource_usage,
+    _solvers,
+    _utils,
+)
+
+_logger = _logging.logger
+
+# Responses carry the captured logs of one part on a single line, which easily
+# exceeds the default 64 KiB line limit of asyncio streams.
+_STREAM_LIMIT = 64 * 1024 * 1024
+
+
+class _SolverWorkerError(_solvers.SolverError):
+    def __init__(self, id_: _solvers.SolverId, traceback: str) -> None:
+        self.id = id_
+        self.traceback = traceback.strip()
+        self.max_width = shutil.get_terminal_size().columns
+
+    def __str__(self) -> str:
+        max_len = min(
+            self.max_width, max(len(line) for line in self.traceback.splitlines())
+        )
+        divider = "-" * max_len
+        return (
+            f"ERROR: Solver failure - {self.id} - Exception in worker"
+            f"\nTraceback:\n{divider}\n{self.traceback}\n{divider}"
+        )
+
+
+class _WorkerExitedError(_solvers.SolverError):
+    def __init__(self, id_: _solvers.SolverId, returncode: int) -> None:
+        super().__init__(
+            f"ERROR: Solver failure - {id_} - Worker exited. Return code: {returncode}"
+        )
+
+
+class _PythonWorker:
+    def __init__(self, proc: asyncio.subprocess.Process) -> None:
+        self._proc = proc
+
+    @classmethod
+    async def start(
+        cls, args: list[str], cwd: pathlib.Path, env: dict[str, str]
+    ) -> _PythonWorker:
+        _logger.debug("Launching python worker: '%s'", " ".join(args))
+        proc = await asyncio.subprocess.create_subprocess_exec(
+            *args,
+            cwd=cwd,
+            env=env,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=_STREAM_LIMIT,
+        )
+        return cls(proc)
+
+    @property
+    def is_alive(self) -> bool:
+        return self._proc.returncode is None
+
+    async def run(
+        self, id_: _solvers.SolverId, request: dict[str, Any]
+    ) -> _exec_solver.SolverRunOutput:
+        assert self._proc.stdin is not None
+        assert self._proc.stdout is not None
+        self._proc.stdin.write(json.dumps(request).encode() + b"\n")
+        await self._proc.stdin.drain()
+        line = await self._proc.stdout.readline()
+        if not line:
+            raise _WorkerExitedError(id_, await self._proc.wait())
+
+        response: dict[str, Any] = json.loads(line)
+        error = response.get("error")
+        if error is not None:
+            assert isinstance(error, str)
+            raise _SolverWorkerError(id_, error)
+
+        answer: str = response["answer"]
+        duration: float = response["duration"]
+        logs: list[str] | None = response["logs"]
+        resources = _resource_usage.ResourceUsage(**response["resources"])
+        profile_file: str | None = response["profile_file"]
+        phases: dict[str, Any] | None = response["phases"]
+        assert isinstance(answer, str)
+        assert isinstance(duration, float)
+        _logger.debug("%s: Worker answer: %s", id_, answer)
+        return _exec_solver.SolverRunOutput(
+            answer,
+            duration,
+            logs,
+            resources,
+            None if profile_file is None else pathlib.Path(profile_file),
+            None if phases is None else _phases.PhaseTimings.from_dict(phases),
+        )
+
+    async def close(self) -> None:
+        assert self._proc.stdin is not None
+        self._proc.stdin.close()
+        await self._proc.wait()
+
+
+class PythonWorkerPool:
+    """Fixed set of worker processes that run Python solvers in-process.
+
+    Each worker imports solver modules on demand and keeps them loaded, so a
+    part only pays for the call of its part function instead of interpreter,
+    mise and uv startup.
+    """
+
+    def __init__(self, size: int) -> None:
+        assert size > 0
+        self._size = size
+        self._workers: list[_PythonWorker] = []
+        self._idle_workers: asyncio.Queue[_PythonWorker] = asyncio.Queue()
+        self._start_args: tuple[list[str], pathlib.Path, dict[str, str]] | None = None
+
+    async def start(
+        self, args: list[str], cwd: pathlib.Path, env: dict[str, str]
+    ) -> None:
+        assert not self._workers
+        _logger.info("Starting %d python workers", self._size)
+        self._start_args = (args, cwd, env)
+        self._workers = await asyncio.gather(
+            *(_PythonWorker.start(args, cwd, env) for _ in range(self._size))
+        )
+        for worker in self._workers:
+            self._idle_workers.put_nowait(worker)
+
+    async def run(
+        self,
+        id_: _solvers.SolverId,
+        module_name: str,
+        input_str: str,
+        options: _exec_solver.SolverExecOptions,
+    ) -> _exec_solver.SolverRunOutput:
+        assert self._workers
+        request = {
+            "module": module_name,
+            "part": id_.part,
+            "verbosity": options.verbosity,
+            "capture_logs": options.capture_stderr,
+            "cpu": options.cpu,
+            "cpu_count": options.cpu_count,
+            "profile": None
+            if options.profiler is None
+            else {
+                "profiler": options.profiler,
+                "output": str(_utils.get_state_dir() / "profiles" / str(id_)),
+            },
+            "phases": options.record_phases,
+            "input": input_str,
+        }
+        worker = await self._idle_workers.get()
+        try:
+            return await worker.run(id_, request)
+        finally:
+            if worker.is_alive:
+                self._idle_workers.put_nowait(worker)
+            else:
+                await self._replace(worker)
+
+    async def _replace(self, worker: _PythonWorker) -> None:
+        """Start a new worker in place of one that exited, e.g. by a crash."""
+        assert self._start_args is not None
+        _logger.warning("Python worker exited, starting a new one")
+        await worker.close()
+        self._workers.remove(worker)
+        replacement = await _PythonWorker.start(*self._start_args)
+        self._workers.append(replacement)
+        self._idle_workers.put_nowait(replacement)
+
+    async def close(self) -> None:
+        await asyncio.gather(*(worker.close() for worker in self._workers))
+        self._workers = []
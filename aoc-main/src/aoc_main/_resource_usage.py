@@ -0,0 +1,50 @@
+import sys
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import resource
+
+
+@dataclass(frozen=True)
+class ResourceUsage:
+    max_rss_bytes: int
+    user_time: float
+    system_time: float
+    minor_page_faults: int
+    major_page_faults: int
+    voluntary_context_switches: int
+    involuntary_context_switches: int
+
+    @classmethod
+    def from_rusage(cls, rusage: resource.struct_rusage) -> ResourceUsage:
+        # ru_maxrss is in kilobytes on Linux but in bytes on macOS
+        max_rss_bytes = rusage.ru_maxrss
+        if sys.platform != "darwin":
+            max_rss_bytes *= 1024
+        return cls(
+            max_rss_bytes,
+            rusage.ru_utime,
+            rusage.ru_stime,
+            rusage.ru_minflt,
+            rusage.ru_majflt,
+            rusage.ru_nvcsw,
+            rusage.ru_nivcsw,
+        )
+
+    @property
+    def cpu_time(self) -> float:
+        return self.user_time + self.system_time
+
+    @property
+    def max_rss_mib(self) -> float:
+        return self.max_rss_bytes / (1024 * 1024)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.max_rss_mib:.1f} MiB, "
+            f"cpu {self.user_time:.3f}s user {self.system_time:.3f}s sys, "
+            f"faults {self.minor_page_faults}/{self.major_page_faults}, "
+            f"csw {self.voluntary_context_switches}/"
+            f"{self.involuntary_context_switches}"
+        )
@@ -0,0 +1,57 @@
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING
+
+from aoc_main import _logging, _utils
+
+if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Iterable
+
+    from aoc_main import _solvers
+
+_logger = _logging.logger
+
+
+@dataclass(frozen=True)
+class CachedResult:
+    answer: str
+    duration: float
+
+
+def _get_cache_dir() -> pathlib.Path:
+    cache_dir = _utils.get_state_dir() / "cache"
+    cache_dir.mkdir(exist_ok=True)
+    return cache_dir
+
+
+def compute_key(
+    id_: _solvers.SolverId,
+    source_files: Iterable[pathlib.Path],
+    input_file: pathlib.Path,
+) -> str:
+    """Hash everything that determines the answer of a solver for one part."""
+    digest = hashlib.sha256()
+    digest.update(str(id_).encode())
+    for path in sorted(source_files):
+        digest.update(b"\0" + str(path).encode() + b"\0")
+        digest.update(path.read_bytes())
+    digest.update(b"\0input\0")
+    digest.update(input_file.read_bytes())
+    return digest.hexdigest()
+
+
+def lookup(key: str) -> CachedResult | None:
+    path = _get_cache_dir() / f"{key}.json"
+    if not path.exists():
+        return None
+    try:
+        return CachedResult(**json.loads(path.read_text()))
+    except json.JSONDecodeError, TypeError:
+        _logger.warning("Ignoring malformed cache entry: %s", path)
+        return None
+
+
+def store(key: str, result: CachedResult) -> None:
+    (_get_cache_dir() / f"{key}.json").write_text(json.dumps(asdict(result)))
@@ -0,0 +1,99 @@
+import asyncio
+import contextlib
+import os
+from typing import TYPE_CHECKING
+
+from aoc_main import _history, _logging
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Iterable
+
+    from aoc_main import _solvers
+
+_logger = _logging.logger
+
+_ENV_MAX_PARALLEL = "AOC_MAX_PARALLEL"
+_ENV_PIN_CPUS = "AOC_PIN_CPUS"
+
+# Set for solvers to the number of CPUs they may use for their own parallelism
+ENV_SOLVER_CPUS = "AOC_SOLVER_CPUS"
+
+
+def _get_available_cpus() -> list[int]:
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        # Not available on macOS
+        return list(range(os.cpu_count() or 1))
+
+
+def pin_to_cpu(pid: int, cpu: int | None) -> None:
+    if cpu is None:
+        return
+    try:
+        os.sched_setaffinity(pid, {cpu})
+    except AttributeError:
+        _logger.debug("CPU pinning not supported on this platform")
+
+
+class SolverScheduler:
+    """Limits how many solvers run at once and hands each run a CPU slot.
+
+    Parallelism defaults to the number of CPUs available to this process and can
+    be limited with ``AOC_MAX_PARALLEL``. When ``AOC_PIN_CPUS`` is set, the slot
+    handed out is also the CPU the solver should be pinned to.
+
+    Each solver may use its share of the CPUs among the solvers that run at once,
+    or only its own CPU when pinned.
+    """
+
+    def __init__(self, solver_count: int) -> None:
+        cpus = _get_available_cpus()
+        max_parallel = int(os.environ.get(_ENV_MAX_PARALLEL, "0"))
+        if max_parallel <= 0 or max_parallel > len(cpus):
+            max_parallel = len(cpus)
+        self._max_parallel = max_parallel
+        self._pin_cpus = os.environ.get(_ENV_PIN_CPUS, "0") != "0"
+        running = max(1, min(max_parallel, solver_count))
+        self._cpus_per_slot = 1 if self._pin_cpus else max(1, len(cpus) // running)
+        self._free_cpus: asyncio.Queue[int] = asyncio.Queue()
+        for cpu in cpus[:max_parallel]:
+            self._free_cpus.put_nowait(cpu)
+        _logger.debug(
+            "Scheduler: max parallel: %d; pin CPUs: %s; CPUs per slot: %d",
+            max_parallel,
+            self._pin_cpus,
+            self._cpus_per_slot,
+        )
+
+    @property
+    def max_parallel(self) -> int:
+        return self._max_parallel
+
+    @property
+    def cpus_per_slot(self) -> int:
+        return self._cpus_per_slot
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncGenerator[int | None]:
+        """Wait for a free slot and yield the CPU to pin to, if pinning is enabled."""
+        cpu = await self._free_cpus.get()
+        try:
+            yield cpu if self._pin_cpus else None
+        finally:
+            self._free_cpus.put_nowait(cpu)
+
+
+def order_longest_first(
+    solver_ids: Iterable[_solvers.SolverId],
+) -> list[_solvers.SolverId]:
+    """Order solvers by their previously recorded duration, longest first.
+
+    Solvers without a recorded duration go first as their cost is unknown.
+    """
+    durations = _history.read_expected_durations()
+
+    def sort_key(id_: _solvers.SolverId) -> float:
+        return durations.get(id_, float("inf"))
+
+    return sorted(solver_ids, key=sort_key, reverse=True)
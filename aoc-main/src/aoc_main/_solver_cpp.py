@@ -141,6 +141,9 @@ class SolverCpp:
         await self._build_library(dry_run=dry_run)
         await self._build_binaries(dry_run=dry_run)
 
+    async def close(self) -> None:
+        pass
+
     def get_exec_info(self, id_: _solvers.SolverId) -> _SolverExecInfoCpp:
         executable_dir = self._binary_dir
         executable_name = _CppBinaryId(id_.year, id_.day).cmake_target_name()
@@ -251,6 +254,10 @@ class _SolverExecInfoCpp:
     def __init__(self, executable: pathlib.Path) -> None:
         self._executable = executable
 
+    @property
+    def source_files(self) -> list[pathlib.Path]:
+        return [self._executable]
+
     @property
     def run_args(self) -> list[str]:
         return [str(self._executable)]
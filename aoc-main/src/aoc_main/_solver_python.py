@@ -1,10 +1,25 @@
+import ast
 import asyncio
+import functools
 import os
+from typing import TYPE_CHECKING
 
-from aoc_main import _logging, _solvers
+from aoc_main import _logging, _python_worker, _solvers
+
+if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Iterable, Sequence
+
+    from aoc_main import _exec_solver
 
 _logger = _logging.logger
 
+_ENV_WORKERS = "AOC_PYTHON_WORKERS"
+
+_WORKER_MODULE = "aoc.tooling.worker"
+
+_PACKAGE_NAME = "aoc"
+
 
 class _UvSyncError(_solvers.SolverPrepareError):
     def __init__(self, returncode: int) -> None:
@@ -14,12 +29,66 @@ class _UvSyncError(_solvers.SolverPrepareError):
         )
 
 
+def _uv_env() -> dict[str, str]:
+    env = os.environ.copy()
+    del env["VIRTUAL_ENV"]
+    return env
+
+
+def _get_source_root_dir() -> pathlib.Path:
+    return _solvers.get_solver_root_dir(_solvers.Solver.Python) / "src"
+
+
+def _find_module_file(module_name: str) -> pathlib.Path | None:
+    module_path = _get_source_root_dir().joinpath(*module_name.split("."))
+    for candidate in (module_path.with_suffix(".py"), module_path / "__init__.py"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _get_imported_module_names(module_file: pathlib.Path) -> Iterable[str]:
+    for node in ast.walk(ast.parse(module_file.read_bytes())):
+        if isinstance(node, ast.Import):
+            yield from (alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module is not None:
+            yield node.module
+            # Names imported from a package may be submodules
+            yield from (f"{node.module}.{alias.name}" for alias in node.names)
+
+
+@functools.cache
+def _get_module_source_files(module_name: str) -> list[pathlib.Path]:
+    """Return the files of the module and of the solver modules it imports."""
+    source_files: set[pathlib.Path] = set()
+    pending = [module_name]
+    while pending:
+        name = pending.pop()
+        if name.partition(".")[0] != _PACKAGE_NAME:
+            continue
+        module_file = _find_module_file(name)
+        if module_file is None or module_file in source_files:
+            continue
+        source_files.add(module_file)
+        pending.extend(_get_imported_module_names(module_file))
+    assert source_files, module_name
+    return sorted(source_files)
+
+
 class SolverPython:
-    def __init__(self) -> None:
-        pass
+    def __init__(self, solver_ids: Sequence[_solvers.SolverId]) -> None:
+        worker_count = int(os.environ.get(_ENV_WORKERS, "0"))
+        if worker_count <= 0:
+            worker_count = min(os.cpu_count() or 1, len(solver_ids))
+        self._worker_pool = _python_worker.PythonWorkerPool(worker_count)
 
     async def prepare(self, *, dry_run: bool) -> None:
         await self._uv_sync(dry_run=dry_run)
+        if not dry_run:
+            await self._start_workers()
+
+    async def close(self) -> None:
+        await self._worker_pool.close()
 
     async def _uv_sync(self, *, dry_run: bool) -> None:
         _logger.info("CMake configure")
@@ -29,13 +98,10 @@ class SolverPython:
         if dry_run:
             args.insert(0, "echo")
 
-        env = os.environ.copy()
-        del env["VIRTUAL_ENV"]
-
         proc = await asyncio.subprocess.create_subprocess_exec(
             *args,
             cwd=_solvers.get_solver_root_dir(_solvers.Solver.Python),
-            env=env,
+            env=_uv_env(),
             stderr=asyncio.subprocess.STDOUT,
             stdout=asyncio.subprocess.PIPE,
         )
@@ -45,17 +111,35 @@ class SolverPython:
             _logger.error("uv sync failed: %s", stdout.decode())
             raise _UvSyncError(proc.returncode)
 
+    async def _start_workers(self) -> None:
+        await self._worker_pool.start(
+            ["mise", "exec", "--", "uv", "run", "python", "-m", _WORKER_MODULE],
+            _solvers.get_solver_root_dir(_solvers.Solver.Python),
+            _uv_env(),
+        )
+
     def get_exec_info(self, id_: _solvers.SolverId) -> _SolverExecInfoPython:
-        return _SolverExecInfoPython(f"aoc.y{id_.year}.d{id_.day:02}")
+        return _SolverExecInfoPython(
+            f"aoc.y{id_.year}.d{id_.day:02}", self._worker_pool
+        )
 
 
 class _SolverExecInfoPython:
-    def __init__(self, module_name: str) -> None:
+    def __init__(
+        self, module_name: str, worker_pool: _python_worker.PythonWorkerPool
+    ) -> None:
         self._module_name = module_name
+        self._worker_pool = worker_pool
 
     @property
-    def run_args(self) -> list[str]:
-        return ["mise", "exec", "--", "uv", "run", "python", "-m", self._module_name]
+    def source_files(self) -> list[pathlib.Path]:
+        lock_file = _solvers.get_solver_root_dir(_solvers.Solver.Python) / "uv.lock"
+        return [*_get_module_source_files(self._module_name), lock_file]
 
-    def adjust_run_environment(self, env: dict[str, str]) -> None:
-        del env["VIRTUAL_ENV"]
+    async def run_in_worker(
+        self,
+        id_: _solvers.SolverId,
+        input_str: str,
+        options: _exec_solver.SolverExecOptions,
+    ) -> _exec_solver.SolverRunOutput:
+        return await self._worker_pool.run(id_, self._module_name, input_str, options)
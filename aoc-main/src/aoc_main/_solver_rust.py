@@ -52,6 +52,9 @@ class SolverRust:
         await self._build_library(dry_run=dry_run)
         await self._build_binaries(dry_run=dry_run)
 
+    async def close(self) -> None:
+        pass
+
     def get_exec_info(self, id_: _solvers.SolverId) -> _SolverExecInfoRust:
         executable = self._executables_by_id[_CargoBinaryId(id_.year, id_.day)]
         assert executable is not None
@@ -146,6 +149,10 @@ class _SolverExecInfoRust:
     def __init__(self, executable: pathlib.Path) -> None:
         self._executable = executable
 
+    @property
+    def source_files(self) -> list[pathlib.Path]:
+        return [self._executable]
+
     @property
     def run_args(self) -> list[str]:
         return [str(self._executable)]
@@ -3,3 +3,10 @@ import pathlib
 
 def get_repo_root() -> pathlib.Path:
     return pathlib.Path(__file__).parent.parent.parent.parent
+
+
+def get_state_dir() -> pathlib.Path:
+    """Directory for data aoc-main keeps between runs, such as solver durations."""
+    state_dir = get_repo_root() / ".aoc"
+    state_dir.mkdir(exist_ok=True)
+    return state_dir
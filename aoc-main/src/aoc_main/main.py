@@ -1,5 +1,7 @@
 import asyncio
+import dataclasses
 import logging
+import os
 import sys
 import time
 import typing
@@ -9,8 +11,13 @@ from typing import NewType
 
 from aoc_main import (
     _answers,
+    _duration_stats,
     _exec_solver,
+    _history,
     _logging,
+    _phases,
+    _resource_usage,
+    _scheduler,
     _solver_cpp,
     _solver_python,
     _solver_rust,
@@ -19,10 +26,18 @@ from aoc_main import (
 )
 
 if typing.TYPE_CHECKING:
+    import pathlib
     from collections.abc import AsyncIterator, Iterable
 
 _logger = _logging.logger
 
+_ENV_NO_CACHE = "AOC_NO_CACHE"
+_ENV_PROFILE = "AOC_PROFILE"
+
+
+def _is_env_flag_set(name: str) -> bool:
+    return os.environ.get(name, "") not in ("", "0", "false")
+
 
 def async_main() -> None:
     asyncio.run(_main())
@@ -45,6 +60,10 @@ async def _main() -> None:
                 exit_code = await day_(argv, behavior)
             case "all":
                 exit_code = await all_(behavior)
+            case "bench":
+                exit_code = await bench(argv, behavior)
+            case "compare":
+                exit_code = compare(argv, behavior)
             case _:
                 print("Unknown mode", file=sys.stderr)
                 exit_code = _ExitCode(1)
@@ -109,6 +128,79 @@ async def single(argv: list[str], behavior: _Behavior) -> _ExitCode:
     return await _solve_one_solver(solver_ids[0], behavior)
 
 
+async def bench(argv: list[str], behavior: _Behavior) -> _ExitCode:
+    runs, warmup, *selection = map(int, argv)
+    if runs <= 0 or warmup < 0:
+        print("Runs must be positive and warmup non-negative", file=sys.stderr)
+        return _ExitCode(1)
+
+    match selection:
+        case []:
+            part_ids = list(_answers.get_part_ids_for_all_known_answers())
+        case [year]:
+            part_ids = list(
+                _answers.get_part_ids_for_known_answers_for_one_year(_types.Year(year))
+            )
+        case [year, day]:
+            part_ids = list(
+                _answers.get_part_ids_for_known_answers_for_one_day(
+                    _types.Year(year), _types.Day(day)
+                )
+            )
+        case [year, day, part]:
+            assert _types.is_part(part)
+            part_ids = [_types.PartId(_types.Year(year), _types.Day(day), part)]
+        case _:
+            print("Too many arguments", file=sys.stderr)
+            return _ExitCode(1)
+
+    return await _bench_many_parts(part_ids, behavior, runs=runs, warmup=warmup)
+
+
+def compare(argv: list[str], behavior: _Behavior) -> _ExitCode:
+    threshold_arg, *baseline_arg = argv
+    threshold = float(threshold_arg) / 100
+    baseline_commit = baseline_arg[0] if baseline_arg else None
+
+    entries = [
+        entry
+        for entry in _history.read_history()
+        if behavior.solver is None or entry.solver == behavior.solver
+    ]
+    comparisons = sorted(
+        _history.compare_durations(entries, baseline_commit),
+        key=lambda comparison: (
+            comparison.id.year,
+            comparison.id.day,
+            comparison.id.part,
+            comparison.id.solver,
+        ),
+    )
+    if not comparisons:
+        print("No recorded runs to compare")
+        return _ExitCode(0)
+
+    regressions = 0
+    for comparison in comparisons:
+        id_ = comparison.id
+        msg = (
+            f"{id_.year} {id_.day:2} {id_.part} {id_.solver}: "
+            f"{comparison.current:.3f}s vs {comparison.baseline:.3f}s "
+            f"({comparison.change:+.0%}) at {comparison.baseline_revision}"
+        )
+        if comparison.is_regression(threshold):
+            regressions += 1
+            msg += ": REGRESSION"
+        print(msg)
+
+    if regressions:
+        print(f"Finished with {regressions} regressions over {threshold:.0%}")
+        return _ExitCode(1)
+
+    print(f"Finished without regressions over {threshold:.0%}")
+    return _ExitCode(0)
+
+
 def get_solver_ids(
     part_ids: Iterable[_types.PartId], solver: _solvers.Solver | None
 ) -> list[_solvers.SolverId]:
@@ -129,7 +221,16 @@ async def _solve_one_solver(id_: _solvers.SolverId, behavior: _Behavior) -> _Exi
     assert len(results) == 1
     result = results[0]
 
-    print(f"Duration: {result.duration:.3f}s")
+    cached = " (cached)" if result.cached else ""
+    print(f"Duration: {result.duration:.3f}s{cached}")
+    if result.resources is not None:
+        print(f"Resources: {result.resources}")
+    if result.profile_file is not None:
+        print(f"Profile: {result.profile_file}")
+    if result.phases is not None:
+        print("Phases:")
+        for line in result.phases.report_lines(result.duration):
+            print(f"    {line}")
     if result.incorrect:
         print(
             f"Incorrect answer: {result.answer}. Correct is: {result.correct_answer}",
@@ -148,7 +249,7 @@ async def _solve_many_parts(
     behavior: _Behavior,
 ) -> _ExitCode:
     all_passed = None
-    slowest = None
+    summary = _ManyPartsSummary()
     start = time.perf_counter()
 
     solvers = _Solvers(get_solver_ids(part_ids, behavior.solver))
@@ -158,21 +259,11 @@ async def _solve_many_parts(
         if all_passed is None:
             all_passed = passed
         all_passed &= passed
-        assert result.duration is not None
-        if slowest is None:
-            slowest = result
-        else:
-            assert slowest.duration is not None
-            if result.duration > slowest.duration:
-                slowest = result
+        summary.add(result)
 
     duration = time.perf_counter() - start
 
-    if slowest is not None:
-        print(
-            f"Slowest: {slowest.id.year} {slowest.id.day:2} {slowest.id.part}: "
-            f"{slowest.duration:.3f}s"
-        )
+    summary.report()
 
     if all_passed is None:
         print(f"No answers known. Duration {duration:.3f}s")
@@ -186,6 +277,99 @@ async def _solve_many_parts(
     return _ExitCode(1)
 
 
+class _ManyPartsSummary:
+    def __init__(self) -> None:
+        self._slowest: _SolverResult | None = None
+        self._most_memory: (
+            tuple[_SolverResult, _resource_usage.ResourceUsage] | None
+        ) = None
+        self._cpu_time = 0.0
+
+    def add(self, result: _SolverResult) -> None:
+        if self._slowest is None or result.duration > self._slowest.duration:
+            self._slowest = result
+
+        resources = result.resources
+        if resources is None:
+            return
+        self._cpu_time += resources.cpu_time
+        if (
+            self._most_memory is None
+            or resources.max_rss_bytes > self._most_memory[1].max_rss_bytes
+        ):
+            self._most_memory = (result, resources)
+
+    def report(self) -> None:
+        if self._slowest is not None:
+            id_ = self._slowest.id
+            print(
+                f"Slowest: {id_.year} {id_.day:2} {id_.part}: "
+                f"{self._slowest.duration:.3f}s"
+            )
+        if self._most_memory is not None:
+            result, resources = self._most_memory
+            id_ = result.id
+            print(
+                f"Most memory hungry: {id_.year} {id_.day:2} {id_.part} "
+                f"{id_.solver}: {resources.max_rss_mib:.1f} MiB"
+            )
+            print(f"Total CPU time: {self._cpu_time:.3f}s")
+
+
+async def _bench_many_parts(
+    part_ids: Iterable[_types.PartId],
+    behavior: _Behavior,
+    *,
+    runs: int,
+    warmup: int,
+) -> _ExitCode:
+    all_passed = True
+    durations_by_solver: dict[_solvers.Solver, list[list[float]]] = defaultdict(list)
+
+    solvers = _Solvers(get_solver_ids(part_ids, behavior.solver))
+
+    async for results in solvers.bench_solvers(behavior, runs=runs, warmup=warmup):
+        all_passed &= _report_one_of_many_bench_results(results)
+        durations_by_solver[results[0].id.solver].append(
+            [result.duration for result in results]
+        )
+
+    for solver, durations_by_part in sorted(durations_by_solver.items()):
+        # Statistics of the total time the parts of one language take per run
+        totals = [sum(durations) for durations in zip(*durations_by_part, strict=True)]
+        stats = _duration_stats.DurationStats.from_durations(totals)
+        print(f"Total {solver} ({len(durations_by_part)} parts): {stats}")
+
+    if all_passed:
+        print(f"Finished with all passing. Runs: {runs}; Warmup runs: {warmup}")
+        return _ExitCode(0)
+
+    print(f"Finished with failures. Runs: {runs}; Warmup runs: {warmup}")
+    return _ExitCode(1)
+
+
+def _report_one_of_many_bench_results(results: list[_SolverResult]) -> bool:
+    id_ = results[0].id
+    stats = _duration_stats.DurationStats.from_durations(
+        [result.duration for result in results]
+    )
+    msg = f"{id_.year} {id_.day:2} {id_.part} {id_.solver}: {stats}: "
+    incorrect = next((result for result in results if result.incorrect), None)
+    if incorrect is not None:
+        msg += (
+            f"FAIL: Incorrect answer: {incorrect.answer}. "
+            f"Correct is: {incorrect.correct_answer}"
+        )
+    else:
+        msg += "PASS"
+    print(msg)
+    phases = [result.phases for result in results if result.phases is not None]
+    if phases:
+        for line in _phases.PhaseTimings.median_of(phases).report_lines(stats.median):
+            print(f"    {line}")
+    return incorrect is None
+
+
 def _report_one_of_many_results(result: _SolverResult) -> bool:
     msg = f"{result.id.year} {result.id.day:2} {result.id.part} {result.id.solver}: "
     logs = result.logs
@@ -195,6 +379,12 @@ def _report_one_of_many_results(result: _SolverResult) -> bool:
         for log in logs:
             print(f"    {log}")
     msg += f"{result.duration:.3f}s: "
+    if result.resources is not None:
+        msg += f"{result.resources}: "
+    if result.profile_file is not None:
+        msg += f"PROFILE {result.profile_file}: "
+    if result.cached:
+        msg += "CACHED: "
     if result.incorrect:
         msg += (
             f"FAIL: Incorrect answer: {result.answer}. "
@@ -203,6 +393,9 @@ def _report_one_of_many_results(result: _SolverResult) -> bool:
     else:
         msg += "PASS"
     print(msg)
+    if result.phases is not None:
+        for line in result.phases.report_lines(result.duration):
+            print(f"    {line}")
     return not result.incorrect
 
 
@@ -235,7 +428,9 @@ class _Solvers:
                 case _solvers.Solver.Cpp:
                     solvers_by_type[type_] = _solver_cpp.SolverCpp(solver_ids_for_type)
                 case _solvers.Solver.Python:
-                    solvers_by_type[type_] = _solver_python.SolverPython()
+                    solvers_by_type[type_] = _solver_python.SolverPython(
+                        solver_ids_for_type
+                    )
                 case _solvers.Solver.Rust:
                     solvers_by_type[type_] = _solver_rust.SolverRust(
                         solver_ids_for_type
@@ -261,6 +456,53 @@ class _Solvers:
         *,
         capture_stderr: bool,
     ) -> AsyncIterator[_SolverResult]:
+        options = _exec_solver.SolverExecOptions(
+            behavior.verbosity,
+            dry_run=behavior.dry_run,
+            capture_stderr=capture_stderr,
+            use_cache=not _is_env_flag_set(_ENV_NO_CACHE),
+            profiler=os.environ.get(_ENV_PROFILE) or None,
+            record_phases=_is_env_flag_set(_phases.ENV_PHASES),
+        )
+        async for exec_results in self._exec_solvers(
+            behavior, options, runs=1, warmup=0
+        ):
+            (exec_result,) = exec_results
+            yield _create_solver_result(exec_result, behavior)
+
+    async def bench_solvers(
+        self, behavior: _Behavior, *, runs: int, warmup: int
+    ) -> AsyncIterator[list[_SolverResult]]:
+        """Run every solver repeatedly and yield the results of the measured runs.
+
+        The runs of one solver are sequential so that they do not compete with
+        each other. Warmup runs are executed first and their results discarded.
+        """
+        options = _exec_solver.SolverExecOptions(
+            behavior.verbosity,
+            dry_run=behavior.dry_run,
+            capture_stderr=True,
+            record_phases=_is_env_flag_set(_phases.ENV_PHASES),
+        )
+        async for exec_results in self._exec_solvers(
+            behavior, options, runs=runs, warmup=warmup
+        ):
+            yield [
+                _create_solver_result(exec_result, behavior)
+                for exec_result in exec_results
+            ]
+
+    async def _exec_solvers(
+        self,
+        behavior: _Behavior,
+        options: _exec_solver.SolverExecOptions,
+        *,
+        runs: int,
+        warmup: int,
+    ) -> AsyncIterator[list[_exec_solver.SolverExecResult]]:
+        assert runs > 0
+        assert warmup >= 0
+
         await asyncio.gather(
             *(
                 asyncio.create_task(solver.prepare(dry_run=behavior.dry_run))
@@ -268,22 +510,42 @@ class _Solvers:
             )
         )
 
-        tasks = [
-            asyncio.create_task(
-                _exec_solver.exec_solver(
-                    id_,
-                    solver.get_exec_info(id_),
-                    behavior.verbosity,
-                    dry_run=behavior.dry_run,
-                    capture_stderr=capture_stderr,
+        scheduler = _scheduler.SolverScheduler(len(self._solvers_for_ids))
+
+        async def exec_scheduled(
+            id_: _solvers.SolverId,
+        ) -> list[_exec_solver.SolverExecResult]:
+            async with scheduler.slot() as cpu:
+                info = self._solvers_for_ids[id_].get_exec_info(id_)
+                slot_options = dataclasses.replace(
+                    options, cpu=cpu, cpu_count=scheduler.cpus_per_slot
                 )
-            )
-            for id_, solver in self._solvers_for_ids.items()
+                for _ in range(warmup):
+                    await _exec_solver.exec_solver(id_, info, slot_options)
+                return [
+                    await _exec_solver.exec_solver(id_, info, slot_options)
+                    for _ in range(runs)
+                ]
+
+        tasks = [
+            asyncio.create_task(exec_scheduled(id_))
+            for id_ in _scheduler.order_longest_first(self._solvers_for_ids)
         ]
 
-        async for task in asyncio.as_completed(tasks):
-            exec_result = await task
-            yield _create_solver_result(exec_result, behavior)
+        all_exec_results: list[_exec_solver.SolverExecResult] = []
+        try:
+            async for task in asyncio.as_completed(tasks):
+                exec_results = await task
+                all_exec_results.extend(exec_results)
+                yield exec_results
+        finally:
+            await asyncio.gather(*(solver.close() for solver in self._solvers))
+
+        # Profiler overhead would distort the recorded durations
+        if not behavior.dry_run and options.profiler is None:
+            await _history.record_results(
+                result for result in all_exec_results if not result.cached
+            )
 
 
 @dataclass(frozen=True)
@@ -293,6 +555,10 @@ class _SolverResult:
     duration: float
     correct_answer: _answers.AnswerType | None
     logs: list[str] | None = None
+    resources: _resource_usage.ResourceUsage | None = None
+    profile_file: pathlib.Path | None = None
+    phases: _phases.PhaseTimings | None = None
+    cached: bool = False
 
     @property
     def correct(self) -> bool:
@@ -315,4 +581,8 @@ def _create_solver_result(
         result.duration,
         correct_answer,
         result.logs,
+        result.resources,
+        result.profile_file,
+        result.phases,
+        result.cached,
     )
@@ -0,0 +1,23 @@
+import pytest
+
+from aoc_main._duration_stats import DurationStats
+
+
+def test_single_duration() -> None:
+    stats = DurationStats.from_durations([0.5])
+    assert stats == DurationStats(1, 0.5, 0.5, 0.5, 0.0, 0.5)
+
+
+def test_many_durations() -> None:
+    stats = DurationStats.from_durations([float(n) for n in range(1, 21)])
+    assert stats.count == 20
+    assert stats.min == 1.0
+    assert stats.median == 10.5
+    assert stats.mean == 10.5
+    assert stats.stddev == pytest.approx(5.916, abs=1e-3)
+    assert stats.p95 == pytest.approx(19.05)
+
+
+def test_no_durations_raises() -> None:
+    with pytest.raises(ValueError, match=r"\[\]"):
+        DurationStats.from_durations([])
@@ -0,0 +1,68 @@
+from aoc_main._history import HistoryEntry, compare_durations
+from aoc_main._solvers import Solver, SolverId
+from aoc_main._types import Day, Year
+
+_ID = SolverId(Year(2023), Day(12), 2, Solver.Python)
+
+
+def _entry(
+    duration: float, commit: str | None, *, dirty: bool = False, day: int = 12
+) -> HistoryEntry:
+    return HistoryEntry(
+        "2026-01-01T00:00:00+00:00",
+        2023,
+        day,
+        2,
+        "python",
+        "42",
+        duration,
+        commit,
+        dirty,
+        "machine",
+    )
+
+
+def test_compare_against_previous_revision() -> None:
+    entries = [_entry(1.0, "aaa"), _entry(1.2, "aaa"), _entry(2.0, "bbb")]
+    (comparison,) = compare_durations(entries)
+    assert comparison.id == _ID
+    assert comparison.baseline == 1.1
+    assert comparison.baseline_revision == "aaa"
+    assert comparison.current == 2.0
+    assert comparison.current_revision == "bbb"
+    assert comparison.is_regression(0.5)
+    assert not comparison.is_regression(1.0)
+
+
+def test_compare_against_explicit_baseline_commit() -> None:
+    entries = [_entry(1.0, "aaa111"), _entry(3.0, "bbb222"), _entry(1.5, "ccc333")]
+    (comparison,) = compare_durations(entries, "aaa")
+    assert comparison.baseline == 1.0
+    assert comparison.current == 1.5
+
+
+def test_dirty_tree_is_its_own_revision() -> None:
+    entries = [_entry(1.0, "aaa"), _entry(1.0, "aaa", dirty=True)]
+    (comparison,) = compare_durations(entries)
+    assert comparison.baseline_revision == "aaa"
+    assert comparison.current_revision == "aaa-dirty"
+
+
+def test_without_baseline_nothing_is_compared() -> None:
+    assert compare_durations([_entry(1.0, "aaa"), _entry(1.1, "aaa")]) == []
+
+
+def test_small_absolute_change_is_not_a_regression() -> None:
+    (comparison,) = compare_durations([_entry(0.001, "aaa"), _entry(0.004, "bbb")])
+    assert comparison.change > 1
+    assert not comparison.is_regression(0.1)
+
+
+def test_solvers_are_compared_separately() -> None:
+    entries = [
+        _entry(1.0, "aaa", day=1),
+        _entry(1.0, "aaa"),
+        _entry(2.0, "bbb", day=1),
+    ]
+    (comparison,) = compare_durations(entries)
+    assert comparison.id.day == 1
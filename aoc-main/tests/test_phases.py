@@ -0,0 +1,46 @@
+import pytest
+
+from aoc_main._phases import PhaseTimings, split_phases_from_stderr
+
+
+def test_split_phases_from_stderr() -> None:
+    logs, timings = split_phases_from_stderr(
+        [
+            "INFO:d10.py:Parsing",
+            'aoc-phases: {"durations": {"parse": 0.5}, "counters": {"nodes": 3}}',
+            "INFO:d10.py:Done",
+        ]
+    )
+    assert logs == ["INFO:d10.py:Parsing", "INFO:d10.py:Done"]
+    assert timings == PhaseTimings({"parse": 0.5}, {"nodes": 3})
+
+
+def test_split_keeps_malformed_phases_line_as_log() -> None:
+    logs, timings = split_phases_from_stderr(["aoc-phases: {"])
+    assert logs == ["aoc-phases: {"]
+    assert timings is None
+
+
+def test_median_of_runs() -> None:
+    timings = PhaseTimings.median_of(
+        [
+            PhaseTimings({"parse": 1.0, "solve": 2.0}, {"nodes": 10}),
+            PhaseTimings({"parse": 3.0}, {"nodes": 20}),
+            PhaseTimings({"parse": 2.0, "solve": 4.0}, {"nodes": 30}),
+        ]
+    )
+    assert list(timings.durations) == ["parse", "solve"]
+    assert timings.durations["parse"] == 2.0
+    assert timings.durations["solve"] == 2.0
+    assert timings.counters == {"nodes": 20}
+
+
+def test_report_lines() -> None:
+    lines = PhaseTimings({"parse": 0.25}, {"nodes": 7}).report_lines(1.0)
+    assert lines == ["parse: 0.250s (25%)", "nodes: 7"]
+    assert PhaseTimings({"parse": 0.25}, {}).report_lines(0.0) == ["parse: 0.250s"]
+
+
+def test_from_dict_requires_both_keys() -> None:
+    with pytest.raises(KeyError):
+        PhaseTimings.from_dict({"durations": {}})
@@ -0,0 +1,63 @@
+import asyncio
+import dataclasses
+import json
+import pathlib
+import sys
+
+import pytest
+
+from aoc_main._exec_solver import SolverExecOptions
+from aoc_main._python_worker import PythonWorkerPool
+from aoc_main._resource_usage import ResourceUsage
+from aoc_main._solvers import Solver, SolverError, SolverId
+from aoc_main._types import Day, Part, Year
+
+# Answers each request with its input, or exits when the input is "exit". The
+# resource usage of the responses is the first argument.
+_FAKE_WORKER = """
+import json, sys
+for line in sys.stdin:
+    request = json.loads(line)
+    if request["input"] == "exit":
+        sys.exit(3)
+    response = {
+        "answer": request["input"],
+        "duration": 0.0,
+        "logs": None,
+        "resources": json.loads(sys.argv[1]),
+        "profile_file": None,
+        "phases": None,
+    }
+    print(json.dumps(response), flush=True)
+"""
+
+_RESOURCES = {field.name: 0 for field in dataclasses.fields(ResourceUsage)}
+
+_OPTIONS = SolverExecOptions(verbosity=0, dry_run=False, capture_stderr=True)
+
+
+def _id(part: Part) -> SolverId:
+    return SolverId(Year(2023), Day(1), part, Solver.Python)
+
+
+async def _run_after_worker_exit() -> list[str]:
+    pool = PythonWorkerPool(1)
+    await pool.start(
+        [sys.executable, "-c", _FAKE_WORKER, json.dumps(_RESOURCES)],
+        pathlib.Path.cwd(),
+        {},
+    )
+    try:
+        with pytest.raises(SolverError, match="Worker exited"):
+            await pool.run(_id(1), "aoc.y2023.d01", "exit", _OPTIONS)
+        answers: list[str] = []
+        for part in (1, 2):
+            output = await pool.run(_id(part), "aoc.y2023.d01", f"p{part}", _OPTIONS)
+            answers.append(output.answer)
+        return answers
+    finally:
+        await pool.close()
+
+
+def test_exited_worker_is_replaced() -> None:
+    assert asyncio.run(_run_after_worker_exit()) == ["p1", "p2"]
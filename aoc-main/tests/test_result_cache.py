@@ -0,0 +1,63 @@
+from typing import TYPE_CHECKING
+
+import pytest
+
+from aoc_main._result_cache import CachedResult, compute_key, lookup, store
+from aoc_main._solvers import Solver, SolverId
+from aoc_main._types import Day, Year
+
+if TYPE_CHECKING:
+    import pathlib
+
+_ID = SolverId(Year(2023), Day(1), 1, Solver.Python)
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    state_dir = tmp_path / "state"
+    state_dir.mkdir()
+    monkeypatch.setattr("aoc_main._utils.get_state_dir", lambda: state_dir)
+    return state_dir
+
+
+def _write(path: pathlib.Path, content: str) -> pathlib.Path:
+    path.write_text(content)
+    return path
+
+
+def test_key_depends_on_sources_input_and_part(tmp_path: pathlib.Path) -> None:
+    source = _write(tmp_path / "d01.py", "v1")
+    input_file = _write(tmp_path / "input.txt", "1\n2\n")
+    key = compute_key(_ID, [source], input_file)
+    assert compute_key(_ID, [source], input_file) == key
+
+    other_part = SolverId(Year(2023), Day(1), 2, Solver.Python)
+    assert compute_key(other_part, [source], input_file) != key
+
+    _write(source, "v2")
+    assert compute_key(_ID, [source], input_file) != key
+    _write(source, "v1")
+
+    _write(input_file, "1\n3\n")
+    assert compute_key(_ID, [source], input_file) != key
+
+
+def test_key_does_not_depend_on_source_file_order(tmp_path: pathlib.Path) -> None:
+    first = _write(tmp_path / "a.py", "a")
+    second = _write(tmp_path / "b.py", "b")
+    input_file = _write(tmp_path / "input.txt", "")
+    assert compute_key(_ID, [first, second], input_file) == compute_key(
+        _ID, [second, first], input_file
+    )
+
+
+def test_store_and_lookup() -> None:
+    assert lookup("key") is None
+    store("key", CachedResult("42", 0.5))
+    assert lookup("key") == CachedResult("42", 0.5)
+
+
+def test_malformed_entry_is_ignored(state_dir: pathlib.Path) -> None:
+    (state_dir / "cache").mkdir()
+    (state_dir / "cache" / "key.json").write_text("{")
+    assert lookup("key") is None
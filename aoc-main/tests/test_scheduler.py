@@ -0,0 +1,69 @@
+import pytest
+
+from aoc_main._scheduler import SolverScheduler, order_longest_first
+from aoc_main._solvers import Solver, SolverId
+from aoc_main._types import Day, Part, Year
+
+
+def _id(day: int, part: Part) -> SolverId:
+    return SolverId(Year(2023), Day(day), part, Solver.Python)
+
+
+def _set_expected_durations(
+    monkeypatch: pytest.MonkeyPatch, durations: dict[SolverId, float]
+) -> None:
+    monkeypatch.setattr("aoc_main._history.read_expected_durations", lambda: durations)
+
+
+def test_order_longest_first(monkeypatch: pytest.MonkeyPatch) -> None:
+    _set_expected_durations(
+        monkeypatch, {_id(1, 1): 0.1, _id(2, 1): 2.0, _id(3, 1): 0.5}
+    )
+    assert order_longest_first([_id(1, 1), _id(2, 1), _id(3, 1)]) == [
+        _id(2, 1),
+        _id(3, 1),
+        _id(1, 1),
+    ]
+
+
+def test_order_unknown_durations_first(monkeypatch: pytest.MonkeyPatch) -> None:
+    _set_expected_durations(monkeypatch, {_id(1, 1): 5.0})
+    assert order_longest_first([_id(1, 1), _id(2, 1), _id(2, 2)]) == [
+        _id(2, 1),
+        _id(2, 2),
+        _id(1, 1),
+    ]
+
+
+def test_order_without_recorded_durations_keeps_order(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _set_expected_durations(monkeypatch, {})
+    ids = [_id(1, 1), _id(1, 2), _id(2, 1)]
+    assert order_longest_first(ids) == ids
+
+
+@pytest.mark.parametrize(
+    ("env", "solver_count", "cpus_per_slot"),
+    [
+        ({}, 10, 1),
+        ({}, 1, 8),
+        ({}, 3, 2),
+        ({"AOC_MAX_PARALLEL": "2"}, 10, 4),
+        ({"AOC_MAX_PARALLEL": "2", "AOC_PIN_CPUS": "1"}, 10, 1),
+    ],
+)
+def test_cpus_per_slot(
+    monkeypatch: pytest.MonkeyPatch,
+    env: dict[str, str],
+    solver_count: int,
+    cpus_per_slot: int,
+) -> None:
+    monkeypatch.setattr(
+        "aoc_main._scheduler._get_available_cpus", lambda: list(range(8))
+    )
+    monkeypatch.delenv("AOC_MAX_PARALLEL", raising=False)
+    monkeypatch.delenv("AOC_PIN_CPUS", raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    assert SolverScheduler(solver_count).cpus_per_slot == cpus_per_slot
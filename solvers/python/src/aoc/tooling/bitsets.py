@@ -0,0 +1,135 @@
+from typing import TYPE_CHECKING, ClassVar, Self
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+class GridBitset:
+    """Set of grid cells as the bits of one arbitrary-precision int.
+
+    Cell ``(y, x)`` is bit ``y * width + x``. With ``layers`` above 1 each cell
+    has one bit per layer, e.g. per direction, at ``layer * height * width``
+    plus the bit of the cell, and :meth:`cells` collapses the layers.
+
+    Union and counting handle all bits at once, without hashing a coordinate
+    per cell. Adding or testing a single bit still copies the int, so
+    :meth:`update` collects many bits before adding them.
+    """
+
+    __slots__ = ("_bits", "_height", "_layers", "_width")
+
+    # Mutable, so equal bitsets must not be usable as keys
+    __hash__: ClassVar[None] = None  # type: ignore[assignment]
+
+    def __init__(
+        self, height: int, width: int, *, layers: int = 1, bits: int = 0
+    ) -> None:
+        if height <= 0 or width <= 0 or layers <= 0:
+            raise ValueError((height, width, layers))
+        self._height = height
+        self._width = width
+        self._layers = layers
+        self._bits = bits
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def layers(self) -> int:
+        return self._layers
+
+    @property
+    def bits(self) -> int:
+        return self._bits
+
+    def index(self, y: int, x: int, layer: int = 0) -> int:
+        if not (0 <= y < self._height and 0 <= x < self._width):
+            raise IndexError((y, x))
+        if not 0 <= layer < self._layers:
+            raise IndexError(layer)
+        return (layer * self._height + y) * self._width + x
+
+    def contains(self, y: int, x: int, layer: int = 0) -> bool:
+        return self._bits >> self.index(y, x, layer) & 1 == 1
+
+    def add(self, index: int) -> None:
+        self._bits |= 1 << index
+
+    def update(self, indices: Iterable[int]) -> None:
+        """Add all ``indices``, setting the bits in a buffer first."""
+        buffer = bytearray((self._height * self._width * self._layers + 7) // 8)
+        for index in indices:
+            buffer[index >> 3] |= 1 << (index & 7)
+        self._bits |= int.from_bytes(buffer, "little")
+
+    def __contains__(self, index: int) -> bool:
+        return self._bits >> index & 1 == 1
+
+    def __iter__(self) -> Iterator[int]:
+        """Yield the indices of the set bits in increasing order."""
+        bits = self._bits
+        while bits:
+            lowest = bits & -bits
+            yield lowest.bit_length() - 1
+            bits ^= lowest
+
+    def __len__(self) -> int:
+        return self._bits.bit_count()
+
+    def __bool__(self) -> bool:
+        return self._bits != 0
+
+    def _check_same_shape(self, other: GridBitset) -> None:
+        if (self._height, self._width, self._layers) != (
+            other._height,
+            other._width,
+            other._layers,
+        ):
+            raise ValueError(other)
+
+    def union(self, other: GridBitset) -> GridBitset:
+        self._check_same_shape(other)
+        return GridBitset(
+            self._height,
+            self._width,
+            layers=self._layers,
+            bits=self._bits | other._bits,
+        )
+
+    def __or__(self, other: GridBitset) -> GridBitset:
+        return self.union(other)
+
+    def __ior__(self, other: GridBitset) -> Self:
+        self._check_same_shape(other)
+        self._bits |= other._bits
+        return self
+
+    def cells(self) -> GridBitset:
+        """Cells that have a bit set on any layer."""
+        size = self._height * self._width
+        layer_mask = (1 << size) - 1
+        bits = 0
+        for layer in range(self._layers):
+            bits |= self._bits >> (layer * size) & layer_mask
+        return GridBitset(self._height, self._width, bits=bits)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, GridBitset):
+            return (self._height, self._width, self._layers, self._bits) == (
+                other._height,
+                other._width,
+                other._layers,
+                other._bits,
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return (
+            f"GridBitset({self._height}, {self._width}, layers={self._layers}, "
+            f"bits={self._bits:#x})"
+        )
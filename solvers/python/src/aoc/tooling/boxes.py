@@ -0,0 +1,57 @@
+"""Axis-aligned boxes of integer points: one range per dimension."""
+
+import math
+from typing import TYPE_CHECKING
+
+from attrs import frozen
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+@frozen
+class Box:
+    ranges: tuple[range, ...]
+
+    @property
+    def volume(self) -> int:
+        return math.prod(len(r) for r in self.ranges)
+
+    def __bool__(self) -> bool:
+        return all(self.ranges)
+
+    def __contains__(self, point: Sequence[int]) -> bool:
+        return all(v in r for v, r in zip(point, self.ranges, strict=True))
+
+    def intersection(self, other: Box) -> Box:
+        return Box(
+            tuple(
+                range(max(r.start, o.start), max(min(r.stop, o.stop), r.start))
+                for r, o in zip(self.ranges, other.ranges, strict=True)
+            )
+        )
+
+    def split(self, axis: int, threshold: int) -> tuple[Box, Box]:
+        """Split into the points below ``threshold`` on ``axis`` and the rest.
+
+        Either part may be empty.
+        """
+        r = self.ranges[axis]
+        cut = min(max(threshold, r.start), r.stop)
+        return (
+            self._with_range(axis, range(r.start, cut)),
+            self._with_range(axis, range(cut, r.stop)),
+        )
+
+    def difference(self, other: Box) -> list[Box]:
+        """Disjoint non-empty boxes covering the points not in ``other``."""
+        result: list[Box] = []
+        rest = self
+        for axis, o in enumerate(other.ranges):
+            below, rest = rest.split(axis, o.start)
+            rest, above = rest.split(axis, o.stop)
+            result.extend(box for box in (below, above) if box)
+        return result
+
+    def _with_range(self, axis: int, range_: range) -> Box:
+        return Box((*self.ranges[:axis], range_, *self.ranges[axis + 1 :]))
@@ -0,0 +1,96 @@
+"""Cycle detection in sequences ``s0 = initial, s(i + 1) = step(s(i))``.
+
+:func:`find_cycle_floyd` and :func:`find_cycle_brent` keep only two states, so
+memory stays constant however long the sequence runs before it repeats. Brent's
+algorithm calls ``step`` fewer times. Neither returns if the sequence never
+repeats.
+
+:class:`CycleDetector` finds the cycle in a single pass by remembering a key of
+every state, for loops where the caller needs the states as they are produced.
+"""
+
+from typing import TYPE_CHECKING
+
+from attrs import define, field, frozen
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+
+@frozen
+class Cycle:
+    prefix_length: int
+    """Number of states before the first state of the cycle."""
+    period: int
+
+    def index_at(self, index: int) -> int:
+        """Return the first index of the state at ``index`` of the sequence."""
+        if index < self.prefix_length:
+            return index
+        return self.prefix_length + (index - self.prefix_length) % self.period
+
+
+def find_cycle_floyd[T](initial: T, step: Callable[[T], T]) -> Cycle:
+    tortoise = step(initial)
+    hare = step(tortoise)
+    while tortoise != hare:
+        tortoise = step(tortoise)
+        hare = step(step(hare))
+
+    prefix_length = 0
+    tortoise = initial
+    while tortoise != hare:
+        tortoise = step(tortoise)
+        hare = step(hare)
+        prefix_length += 1
+
+    period = 1
+    hare = step(tortoise)
+    while tortoise != hare:
+        hare = step(hare)
+        period += 1
+
+    return Cycle(prefix_length, period)
+
+
+def find_cycle_brent[T](initial: T, step: Callable[[T], T]) -> Cycle:
+    power = period = 1
+    tortoise = initial
+    hare = step(initial)
+    while tortoise != hare:
+        if power == period:
+            tortoise = hare
+            power *= 2
+            period = 0
+        hare = step(hare)
+        period += 1
+
+    tortoise = hare = initial
+    for _ in range(period):
+        hare = step(hare)
+    prefix_length = 0
+    while tortoise != hare:
+        tortoise = step(tortoise)
+        hare = step(hare)
+        prefix_length += 1
+
+    return Cycle(prefix_length, period)
+
+
+@define
+class CycleDetector[K: Hashable]:
+    """Find a cycle from the keys of states added in sequence order.
+
+    Keys only need to be equal for equal states, so a compact fingerprint of a
+    large state keeps the memory use low.
+    """
+
+    _indices: dict[K, int] = field(init=False, factory=dict[K, int])
+
+    def add(self, key: K) -> Cycle | None:
+        """Add the key of the next state and return the cycle once it repeats."""
+        index = len(self._indices)
+        seen = self._indices.setdefault(key, index)
+        if seen == index:
+            return None
+        return Cycle(seen, index - seen)
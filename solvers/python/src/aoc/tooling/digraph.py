@@ -1,11 +1,15 @@
 import typing
-from functools import cache
 from typing import Protocol, runtime_checkable
 
 from attrs import Factory, define, field
 
 if typing.TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Iterator
+
+
+class DigraphCycleError(ValueError):
+    def __init__(self) -> None:
+        super().__init__("digraph must not contain cycles")
 
 
 @runtime_checkable
@@ -17,12 +21,92 @@ class NodeId(typing.Hashable, Protocol):
 class Digraph[Id: NodeId, N]:
     nodes: dict[Id, N]  # TODO: Consider replacing with a frozendict
     arcs: tuple[DigraphArc[Id], ...]
+    # Arcs by their end nodes, built once so that lookups are O(degree)
+    _arcs_to: dict[Id, list[DigraphArc[Id]]] = field(init=False, repr=False, eq=False)
+    _arcs_from: dict[Id, list[DigraphArc[Id]]] = field(init=False, repr=False, eq=False)
+
+    def __attrs_post_init__(self) -> None:
+        self._arcs_to = {node_id: [] for node_id in self.nodes}
+        self._arcs_from = {node_id: [] for node_id in self.nodes}
+        for arc in self.arcs:
+            self._arcs_to[arc.to].append(arc)
+            self._arcs_from[arc.from_].append(arc)
 
     def get_arcs_to(self, node_id: Id, /) -> list[DigraphArc[Id]]:
-        return _get_arcs_to_node(node_id, self.arcs)
+        return self._arcs_to.get(node_id, [])
 
     def get_arcs_from(self, node_id: Id, /) -> list[DigraphArc[Id]]:
-        return _get_arcs_from_node(node_id, self.arcs)
+        return self._arcs_from.get(node_id, [])
+
+    def topological_order(self) -> list[Id]:
+        """Order the nodes so that every arc leads to a later node."""
+        in_degrees = {node_id: len(arcs) for node_id, arcs in self._arcs_to.items()}
+        order = [node_id for node_id, degree in in_degrees.items() if degree == 0]
+        # The order grows while it is walked, like the queue of a BFS
+        for node_id in order:
+            for arc in self._arcs_from[node_id]:
+                in_degrees[arc.to] -= 1
+                if in_degrees[arc.to] == 0:
+                    order.append(arc.to)
+        if len(order) != len(self.nodes):
+            raise DigraphCycleError
+        return order
+
+    def strongly_connected_components(self) -> list[list[Id]]:
+        """Tarjan's algorithm with an explicit stack, so depth is not limited.
+
+        The components are in topological order: arcs between components only
+        lead to later ones.
+        """
+        return _Tarjan(self._arcs_from).components(self.nodes)
+
+    def condensation(self) -> Digraph[int, list[Id]]:
+        """Acyclic digraph of the strongly connected components.
+
+        Node ``i`` is the ``i``-th component of
+        :meth:`strongly_connected_components` with its node ids.
+        """
+        components = self.strongly_connected_components()
+        component_indices = _component_indices(components)
+        arcs = {
+            Arc(component_indices[arc.from_], component_indices[arc.to]): None
+            for arc in self.arcs
+            if component_indices[arc.from_] != component_indices[arc.to]
+        }
+        return Digraph(nodes=dict(enumerate(components)), arcs=tuple(arcs))
+
+    def reachability(self) -> dict[Id, int]:
+        """Transitive closure as a bitset of the reachable nodes per node.
+
+        Bit ``i`` is the ``i``-th node of :attr:`nodes`. Each node reaches
+        itself. Nodes of a strongly connected component share one bitset.
+        """
+        node_bits = {node_id: 1 << i for i, node_id in enumerate(self.nodes)}
+        components = self.strongly_connected_components()
+        component_indices = _component_indices(components)
+        reachable = [0] * len(components)
+        # Later components are complete before the ones leading to them
+        for i in reversed(range(len(components))):
+            bits = 0
+            for node_id in components[i]:
+                bits |= node_bits[node_id]
+                for arc in self._arcs_from[node_id]:
+                    bits |= reachable[component_indices[arc.to]]
+            reachable[i] = bits
+        return {
+            node_id: reachable[component_indices[node_id]] for node_id in self.nodes
+        }
+
+    def reachable_from(self, node_id: Id, /) -> set[Id]:
+        """Nodes reachable from ``node_id``, including itself."""
+        reachable = {node_id}
+        pending = [node_id]
+        while pending:
+            for arc in self._arcs_from[pending.pop()]:
+                if arc.to not in reachable:
+                    reachable.add(arc.to)
+                    pending.append(arc.to)
+        return reachable
 
 
 class DigraphArc[Id: NodeId](Protocol):
@@ -61,15 +145,55 @@ class DigraphCreator[Id: NodeId, N]:
         return Digraph(nodes=self._nodes, arcs=tuple(self._arcs))
 
 
-@cache
-def _get_arcs_to_node[Id: NodeId](
-    node_id: Id, arcs: Iterable[DigraphArc[Id]]
-) -> list[DigraphArc[Id]]:
-    return [arc for arc in arcs if arc.to == node_id]
-
-
-@cache
-def _get_arcs_from_node[Id: NodeId](
-    node_id: Id, arcs: Iterable[DigraphArc[Id]]
-) -> list[DigraphArc[Id]]:
-    return [arc for arc in arcs if arc.from_ == node_id]
+class _Tarjan[Id: NodeId]:
+    def __init__(self, arcs_from: dict[Id, list[DigraphArc[Id]]]) -> None:
+        self._arcs_from = arcs_from
+        self._indices: dict[Id, int] = {}
+        self._low_links: dict[Id, int] = {}
+        self._stack: list[Id] = []
+        self._on_stack: set[Id] = set()
+        self._components: list[list[Id]] = []
+
+    def components(self, node_ids: Iterable[Id]) -> list[list[Id]]:
+        indices, low_links = self._indices, self._low_links
+        for root in node_ids:
+            if root in indices:
+                continue
+            path = [self._enter(root)]
+            while path:
+                node_id, arcs = path[-1]
+                for arc in arcs:
+                    if arc.to not in indices:
+                        path.append(self._enter(arc.to))
+                        break
+                    if arc.to in self._on_stack:
+                        low_links[node_id] = min(low_links[node_id], indices[arc.to])
+                else:
+                    path.pop()
+                    self._leave(node_id, path[-1][0] if path else None)
+
+        # Tarjan completes a component only after all components it leads to
+        return self._components[::-1]
+
+    def _enter(self, node_id: Id) -> tuple[Id, Iterator[DigraphArc[Id]]]:
+        self._indices[node_id] = self._low_links[node_id] = len(self._indices)
+        self._stack.append(node_id)
+        self._on_stack.add(node_id)
+        return node_id, iter(self._arcs_from[node_id])
+
+    def _leave(self, node_id: Id, parent_id: Id | None) -> None:
+        low_links = self._low_links
+        if parent_id is not None:
+            low_links[parent_id] = min(low_links[parent_id], low_links[node_id])
+        if low_links[node_id] == self._indices[node_id]:
+            component: list[Id] = []
+            while not component or component[-1] != node_id:
+                component.append(self._stack.pop())
+                self._on_stack.remove(component[-1])
+            self._components.append(component)
+
+
+def _component_indices[Id: NodeId](components: list[list[Id]]) -> dict[Id, int]:
+    return {
+        node_id: i for i, component in enumerate(components) for node_id in component
+    }
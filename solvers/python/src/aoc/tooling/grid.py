@@ -0,0 +1,237 @@
+from typing import TYPE_CHECKING, ClassVar, assert_never
+
+from aoc.tooling.coordinates import X, Y
+from aoc.tooling.directions import RotationDirection
+from aoc.tooling.map import Map2dEmptyDataError, Map2dRectangularDataError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+class Grid2d:
+    """Rectangular grid of bytes, e.g. the characters of a map, in one buffer.
+
+    Same coordinate conventions as :class:`aoc.tooling.map.Map2d`, but rows and
+    columns are read, written, compared and counted as whole ``bytes`` objects
+    by slicing the buffer, without creating a Python object per cell.
+
+    :meth:`transpose`, :meth:`rotate` and the flips return views that share the
+    buffer and only remap coordinates, like NumPy strides. Writes through a view
+    are visible in every grid sharing the buffer. :meth:`copy` materialises a
+    view into a grid of its own.
+    """
+
+    __slots__ = ("_buffer", "_height", "_offset", "_stride_x", "_stride_y", "_width")
+
+    # Writable through the grid and its views, so equal grids must not be usable
+    # as keys. ``bytes(grid.tobytes())`` is a key of the current cells.
+    __hash__: ClassVar[None] = None  # type: ignore[assignment]
+
+    def __init__(  # noqa: PLR0913 - strides describe the view
+        self,
+        buffer: bytearray,
+        height: int,
+        width: int,
+        *,
+        offset: int = 0,
+        stride_y: int | None = None,
+        stride_x: int = 1,
+    ) -> None:
+        if height <= 0 or width <= 0:
+            raise Map2dEmptyDataError
+        self._buffer = buffer
+        self._height = height
+        self._width = width
+        self._offset = offset
+        self._stride_y = width if stride_y is None else stride_y
+        self._stride_x = stride_x
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> Grid2d:
+        rows = [line.encode("ascii") for line in lines]
+        if not rows or not rows[0]:
+            raise Map2dEmptyDataError
+        width = len(rows[0])
+        if not all(len(row) == width for row in rows):
+            raise Map2dRectangularDataError
+        return cls(bytearray().join(rows), len(rows), width)
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def tl_y(self) -> Y:
+        return Y(0)
+
+    @property
+    def tl_x(self) -> X:
+        return X(0)
+
+    @property
+    def br_y(self) -> Y:
+        return Y(self._height - 1)
+
+    @property
+    def br_x(self) -> X:
+        return X(self._width - 1)
+
+    def contains(self, y: Y, x: X) -> bool:
+        return 0 <= y < self._height and 0 <= x < self._width
+
+    def _index(self, y: int, x: int) -> int:
+        return self._offset + y * self._stride_y + x * self._stride_x
+
+    def get(self, y: Y, x: X) -> int:
+        return self._buffer[self._index(y, x)]
+
+    def get_or_default(self, y: Y, x: X, default: int | None = None) -> int | None:
+        if not self.contains(y, x):
+            return default
+        return self._buffer[self._index(y, x)]
+
+    def set(self, y: Y, x: X, value: int) -> None:
+        self._buffer[self._index(y, x)] = value
+
+    def _slice(self, start: int, stride: int, length: int) -> slice:
+        stop = start + stride * length
+        # A negative stop would count from the end of the buffer
+        return slice(start, stop if stop >= 0 else None, stride)
+
+    def _row_slice(self, y: int) -> slice:
+        if not 0 <= y < self._height:
+            raise IndexError(y)
+        return self._slice(self._index(y, 0), self._stride_x, self._width)
+
+    def _column_slice(self, x: int) -> slice:
+        if not 0 <= x < self._width:
+            raise IndexError(x)
+        return self._slice(self._index(0, x), self._stride_y, self._height)
+
+    def row(self, y: Y) -> bytes:
+        return bytes(self._buffer[self._row_slice(y)])
+
+    def column(self, x: X) -> bytes:
+        return bytes(self._buffer[self._column_slice(x)])
+
+    def set_row(self, y: Y, values: bytes) -> None:
+        self._buffer[self._row_slice(y)] = values
+
+    def set_column(self, x: X, values: bytes) -> None:
+        self._buffer[self._column_slice(x)] = values
+
+    def rows(self) -> Iterator[bytes]:
+        for y in range(self._height):
+            yield bytes(self._buffer[self._row_slice(y)])
+
+    def columns(self) -> Iterator[bytes]:
+        for x in range(self._width):
+            yield bytes(self._buffer[self._column_slice(x)])
+
+    def count(self, value: int) -> int:
+        if self._is_contiguous():
+            return self._buffer.count(value, self._offset, self._offset + self._size())
+        return sum(row.count(value) for row in self.rows())
+
+    def find_all(self, value: int) -> Iterator[tuple[Y, X]]:
+        needle = bytes((value,))
+        for y, row in enumerate(self.rows()):
+            x = row.find(needle)
+            while x >= 0:
+                yield Y(y), X(x)
+                x = row.find(needle, x + 1)
+
+    def mask(self, values: bytes) -> Grid2d:
+        """Return a new grid with 1 where the cell is one of ``values``, else 0."""
+        table = bytearray(256)
+        for value in values:
+            table[value] = 1
+        return Grid2d(self.tobytes().translate(table), self._height, self._width)
+
+    def _size(self) -> int:
+        return self._height * self._width
+
+    def _is_contiguous(self) -> bool:
+        return self._stride_x == 1 and self._stride_y == self._width
+
+    def tobytes(self) -> bytearray:
+        """Return the cells row by row as a new buffer."""
+        if self._is_contiguous():
+            return self._buffer[self._offset : self._offset + self._size()]
+        return bytearray().join(self.rows())
+
+    def copy(self) -> Grid2d:
+        return Grid2d(self.tobytes(), self._height, self._width)
+
+    def _view(
+        self,
+        origin_y: int,
+        origin_x: int,
+        stride_y: int,
+        stride_x: int,
+        *,
+        transposed: bool = False,
+    ) -> Grid2d:
+        # The origin is the cell of this grid that becomes the top left of the view
+        height, width = self._height, self._width
+        if transposed:
+            height, width = width, height
+        return Grid2d(
+            self._buffer,
+            height,
+            width,
+            offset=self._index(origin_y, origin_x),
+            stride_y=stride_y,
+            stride_x=stride_x,
+        )
+
+    def transpose(self) -> Grid2d:
+        return self._view(0, 0, self._stride_x, self._stride_y, transposed=True)
+
+    def flip_rows(self) -> Grid2d:
+        """Upside down: the last row becomes the first."""
+        return self._view(self._height - 1, 0, -self._stride_y, self._stride_x)
+
+    def flip_columns(self) -> Grid2d:
+        """Mirrored: the last column becomes the first."""
+        return self._view(0, self._width - 1, self._stride_y, -self._stride_x)
+
+    def rotate(self, direction: RotationDirection, count: int = 1) -> Grid2d:
+        if count <= 0:
+            raise ValueError(count)
+        match direction:
+            case RotationDirection.Clockwise:
+                quarter_turns = count % 4
+            case RotationDirection.Counterclockwise:
+                quarter_turns = -count % 4
+            case _:
+                assert_never(direction)
+        match quarter_turns:
+            case 0:
+                return self._view(0, 0, self._stride_y, self._stride_x)
+            case 1:
+                return self.transpose().flip_columns()
+            case 2:
+                return self.flip_rows().flip_columns()
+            case _:
+                return self.transpose().flip_rows()
+
+    def str_lines(self) -> Iterator[str]:
+        for row in self.rows():
+            yield row.decode("ascii")
+
+    def __str__(self) -> str:
+        return "\n".join(self.str_lines())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Grid2d):
+            return (
+                self._height == other._height
+                and self._width == other._width
+                and self.tobytes() == other.tobytes()
+            )
+        return NotImplemented
@@ -1,11 +1,12 @@
 import enum
-from typing import TYPE_CHECKING, Literal, assert_never, overload
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Literal, NamedTuple, assert_never, overload, override
 
 from aoc.tooling.coordinates import X, Y
 from aoc.tooling.directions import RotationDirection
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterable, Sequence
+    from collections.abc import Callable, Iterable, Iterator
 
 
 class Map2dEmptyDataError(ValueError):
@@ -23,9 +24,36 @@ class IterDirection(enum.Enum):
     Columns = enum.auto()
 
 
+class _Orientation(NamedTuple):
+    """Where the cells of a view are in the data it shares.
+
+    The rows of the view are the columns of the data if ``swap`` is set. The
+    flips reverse the rows or the columns of the data.
+    """
+
+    swap: bool = False
+    flip_y: bool = False
+    flip_x: bool = False
+
+    def transposed(self) -> _Orientation:
+        return self._replace(swap=not self.swap)
+
+    def rows_flipped(self) -> _Orientation:
+        if self.swap:
+            return self._replace(flip_x=not self.flip_x)
+        return self._replace(flip_y=not self.flip_y)
+
+    def columns_flipped(self) -> _Orientation:
+        if self.swap:
+            return self._replace(flip_y=not self.flip_y)
+        return self._replace(flip_x=not self.flip_x)
+
+
 class Map2d[Map2dDataType = str]:
     __slots__ = ("_br_x", "_br_y", "_height", "_sequence_data", "_width")
 
+    _sequence_data: Sequence[Sequence[Map2dDataType]]
+
     def __init__(
         self,
         data: Iterable[Iterable[Map2dDataType]] | Iterable[Sequence[Map2dDataType]],
@@ -264,44 +292,202 @@ class Map2d[Map2dDataType = str]:
     def __str__(self) -> str:
         return "\n".join(self.str_lines())
 
+    def rows(self) -> Sequence[Sequence[Map2dDataType]]:
+        return self._sequence_data
+
+    def columns(self) -> Sequence[Sequence[Map2dDataType]]:
+        return self.transpose().rows()
+
+    def materialize(self) -> Map2d[Map2dDataType]:
+        """Return a map that owns its data, i.e. copy the data of a view."""
+        return self
+
+    def _view(
+        self, change: Callable[[_Orientation], _Orientation]
+    ) -> Map2d[Map2dDataType]:
+        return Map2dView(self._sequence_data, change(_Orientation()))
+
     def transpose(self) -> Map2d[Map2dDataType]:
-        return Map2d(list(zip(*self._sequence_data, strict=True)))
+        return self._view(_Orientation.transposed)
 
-    def __rotate_once_clockwise(self) -> Map2d[Map2dDataType]:
-        return Map2d(
-            (data for _, data in items)
-            for _, items in self.iter_data_by_columns(
-                self._br_y, X(0), Y(0), self._br_x
-            )
-        )
+    def flip_rows(self) -> Map2d[Map2dDataType]:
+        """Upside down: the last row becomes the first."""
+        return self._view(_Orientation.rows_flipped)
 
-    def __rotate_once_counterclockwise(self) -> Map2d[Map2dDataType]:
-        return Map2d(
-            (data for _, data in items)
-            for _, items in self.iter_data_by_columns(
-                Y(0), self._br_x, self._br_y, X(0)
-            )
-        )
+    def flip_columns(self) -> Map2d[Map2dDataType]:
+        """Mirrored: the last column becomes the first."""
+        return self._view(_Orientation.columns_flipped)
 
     def rotate(
         self, direction: RotationDirection, count: int = 1
     ) -> Map2d[Map2dDataType]:
         if count <= 0:
             raise ValueError(count)
-        map_ = self
-        for _ in range(count):
-            if direction is RotationDirection.Clockwise:
-                map_ = map_.__rotate_once_clockwise()
-            elif direction is RotationDirection.Counterclockwise:
-                map_ = map_.__rotate_once_counterclockwise()  # noqa: SLF001
-            else:
-                assert_never(direction)
-        return map_
+        if direction is RotationDirection.Clockwise:
+            quarter_turns = count % 4
+        elif direction is RotationDirection.Counterclockwise:
+            quarter_turns = -count % 4
+        else:
+            assert_never(direction)
+
+        def rotate_clockwise(orientation: _Orientation) -> _Orientation:
+            for _ in range(quarter_turns):
+                orientation = orientation.transposed().columns_flipped()
+            return orientation
+
+        return self._view(rotate_clockwise)
 
     def __hash__(self) -> int:
-        return hash(self._sequence_data)
+        return hash(self.materialize()._sequence_data)  # noqa: SLF001
 
     def __eq__(self, other: object) -> bool:
+        # Map2dView is a subclass, so comparing a view with a map falls back to
+        # this method of the view
         if isinstance(other, self.__class__):
-            return self._sequence_data == other._sequence_data
+            return (
+                self.materialize()._sequence_data == other.materialize()._sequence_data
+            )
         return NotImplemented
+
+
+class _ViewRow[T](Sequence[T]):
+    __slots__ = ("_data", "_index", "_orientation")
+
+    def __init__(
+        self, data: Sequence[Sequence[T]], orientation: _Orientation, index: int
+    ) -> None:
+        self._data = data
+        self._orientation = orientation
+        self._index = index
+
+    def _line(self) -> Sequence[T]:
+        data = self._data
+        if self._orientation.swap:
+            x = (
+                len(data[0]) - 1 - self._index
+                if self._orientation.flip_x
+                else self._index
+            )
+            column = tuple(row[x] for row in data)
+            return column[::-1] if self._orientation.flip_y else column
+        y = len(data) - 1 - self._index if self._orientation.flip_y else self._index
+        line = data[y]
+        return line[::-1] if self._orientation.flip_x else line
+
+    def __len__(self) -> int:
+        return len(self._data) if self._orientation.swap else len(self._data[0])
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[T]: ...
+    @override
+    def __getitem__(self, index: int | slice) -> T | Sequence[T]:
+        if isinstance(index, slice):
+            return self._line()[index]
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError(index)
+        orientation = self._orientation
+        y, x = (index, self._index) if orientation.swap else (self._index, index)
+        if orientation.flip_y:
+            y = len(self._data) - 1 - y
+        if orientation.flip_x:
+            x = len(self._data[0]) - 1 - x
+        return self._data[y][x]
+
+    @override
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._line())
+
+
+class _ViewRows[T](Sequence[Sequence[T]]):
+    __slots__ = ("_data", "_orientation")
+
+    def __init__(self, data: Sequence[Sequence[T]], orientation: _Orientation) -> None:
+        self._data = data
+        self._orientation = orientation
+
+    def __len__(self) -> int:
+        return len(self._data[0]) if self._orientation.swap else len(self._data)
+
+    @overload
+    def __getitem__(self, index: int) -> Sequence[T]: ...
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Sequence[T]]: ...
+    @override
+    def __getitem__(self, index: int | slice) -> Sequence[T] | Sequence[Sequence[T]]:
+        length = len(self)
+        if isinstance(index, slice):
+            return [
+                _ViewRow(self._data, self._orientation, i)
+                for i in range(*index.indices(length))
+            ]
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError(index)
+        return _ViewRow(self._data, self._orientation, index)
+
+
+class Map2dView[Map2dDataType = str](Map2d[Map2dDataType]):
+    """Transposed, rotated or flipped map sharing the data of another map.
+
+    Coordinates are remapped on access instead of copying the data. Views of
+    views share the original data, too. :meth:`materialize` copies the data in
+    the orientation of the view when it is accessed often enough to pay off.
+    """
+
+    __slots__ = ("_data", "_orientation")
+
+    def __init__(  # Map2d.__init__ would copy the data
+        self, data: Sequence[Sequence[Map2dDataType]], orientation: _Orientation
+    ) -> None:
+        self._data = data
+        self._orientation = orientation
+        self._sequence_data = _ViewRows(data, orientation)
+        self._height = len(self._sequence_data)
+        self._width = len(self._sequence_data[0])
+        self._br_y = Y(self._height - 1)
+        self._br_x = X(self._width - 1)
+
+    def _source(self, y: int, x: int) -> tuple[int, int]:
+        orientation = self._orientation
+        if orientation.swap:
+            y, x = x, y
+        if orientation.flip_y:
+            y = len(self._data) - 1 - y
+        if orientation.flip_x:
+            x = len(self._data[0]) - 1 - x
+        return y, x
+
+    @override
+    def get(self, y: Y, x: X) -> Map2dDataType:
+        source_y, source_x = self._source(y, x)
+        return self._data[source_y][source_x]
+
+    @override
+    def get_bounded(self, y: Y, x: X) -> Map2dDataType:
+        if not self.contains(y, x):
+            raise IndexError((y, x))
+        return self.get(y, x)
+
+    @override
+    def get_or_default(
+        self, y: Y, x: X, default: Map2dDataType | None = None
+    ) -> Map2dDataType | None:
+        if not self.contains(y, x):
+            return default
+        return self.get(y, x)
+
+    @override
+    def materialize(self) -> Map2d[Map2dDataType]:
+        return Map2d(self._sequence_data)
+
+    @override
+    def _view(
+        self, change: Callable[[_Orientation], _Orientation]
+    ) -> Map2d[Map2dDataType]:
+        return Map2dView(self._data, change(self._orientation))
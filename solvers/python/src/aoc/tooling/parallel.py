@@ -0,0 +1,102 @@
+"""Map a function over independent items on the CPUs the solver may use.
+
+Items are handed out in chunks to a process pool, or to a thread pool when the
+interpreter runs without the GIL. Results keep the order of the items. Log
+records of the worker processes are handled by the loggers of the solver, so
+they show up like any other, also when aoc-main captures them.
+
+The solver may use the CPUs of its process affinity, limited by
+``AOC_SOLVER_CPUS``, which aoc-main sets to the share of each solver it runs at
+once. Everything runs in the calling thread when a debugger is connected, when
+only one CPU is available, e.g. with ``AOC_PIN_CPUS=1``, or when there is at most
+one item. ``func`` and the items must be picklable, so ``func`` has to be defined at
+module level.
+"""
+
+import concurrent.futures
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import sys
+from typing import TYPE_CHECKING
+
+from aoc.tooling import debugger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+# Chunks per worker: enough to even out uneven items, few enough to keep the
+# pickling overhead small
+_CHUNKS_PER_WORKER = 4
+
+ENV_SOLVER_CPUS = "AOC_SOLVER_CPUS"
+
+
+# Forking while the log listener thread runs could deadlock the children, so
+# workers are forked from a clean server process where possible
+_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def _available_cpus() -> int:
+    cpus = os.process_cpu_count() or 1
+    solver_cpus = os.environ.get(ENV_SOLVER_CPUS)
+    if solver_cpus:
+        return max(1, min(int(solver_cpus), cpus))
+    return cpus
+
+
+def _is_gil_enabled() -> bool:
+    is_gil_enabled: Callable[[], bool] | None = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is None or is_gil_enabled()
+
+
+class _ForwardingHandler(logging.Handler):
+    def emit(self, record: logging.LogRecord) -> None:
+        logging.getLogger(record.name).handle(record)
+
+
+def _init_worker_process(
+    log_queue: multiprocessing.Queue[logging.LogRecord], log_level: int
+) -> None:
+    root_logger = logging.getLogger()
+    # Handlers inherited by a forked process would write past the solver
+    root_logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root_logger.setLevel(log_level)
+
+
+def parallel_map[T, R](
+    func: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    max_workers: int | None = None,
+    chunk_size: int | None = None,
+) -> list[R]:
+    item_list = list(items)
+    workers = min(max_workers or _available_cpus(), len(item_list))
+    if workers <= 1 or debugger.is_connected():
+        return [func(item) for item in item_list]
+
+    if chunk_size is None:
+        chunk_size = max(1, len(item_list) // (workers * _CHUNKS_PER_WORKER))
+
+    if not _is_gil_enabled():
+        with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+            return list(executor.map(func, item_list))
+
+    context = multiprocessing.get_context(_START_METHOD)
+    log_queue: multiprocessing.Queue[logging.LogRecord] = context.Queue()
+    listener = logging.handlers.QueueListener(log_queue, _ForwardingHandler())
+    listener.start()
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+            workers,
+            mp_context=context,
+            initializer=_init_worker_process,
+            initargs=(log_queue, logging.getLogger().getEffectiveLevel()),
+        ) as executor:
+            return list(executor.map(func, item_list, chunksize=chunk_size))
+    finally:
+        listener.stop()
@@ -0,0 +1,88 @@
+import cProfile
+import enum
+import inspect
+import pathlib
+import sys
+import threading
+from collections import Counter
+from sys import _current_frames  # pyright: ignore[reportPrivateUsage]
+from typing import TYPE_CHECKING, Self
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import FrameType
+
+
+class Profiler(enum.StrEnum):
+    CProfile = "cprofile"
+    Sample = "sample"
+
+
+# Sampling happens in another thread, which only gets to run when the solver
+# thread releases the GIL. The switch interval is lowered to the sampling
+# interval for the duration of the call so that samples are not 5 ms apart.
+_SAMPLE_INTERVAL = 0.001
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{pathlib.Path(code.co_filename).name}:{code.co_qualname}"
+
+
+class _StackSampler:
+    def __init__(self, thread_id: int, root_frame: FrameType | None) -> None:
+        self._thread_id = thread_id
+        self._root_frame = root_frame
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="aoc-profile-sampler")
+        self.stacks: Counter[str] = Counter()
+
+    def __enter__(self) -> Self:
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(_SAMPLE_INTERVAL)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+
+    def _run(self) -> None:
+        while not self._stop.wait(_SAMPLE_INTERVAL):
+            frame = _current_frames().get(self._thread_id)
+            labels: list[str] = []
+            while frame is not None and frame is not self._root_frame:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if labels:
+                self.stacks[";".join(reversed(labels))] += 1
+
+
+def call_profiled[T, R](
+    profiler: Profiler, func: Callable[[T], R], arg: T, output_stem: pathlib.Path
+) -> tuple[R, pathlib.Path]:
+    """Call ``func(arg)`` under the profiler and write the profile next to the stem.
+
+    ``Profiler.CProfile`` writes a ``.pstats`` file for :mod:`pstats` and tools
+    like snakeviz. ``Profiler.Sample`` writes a ``.collapsed`` file with one
+    ``frame;frame;frame count`` line per sampled stack, the input format of
+    flamegraph.pl, inferno and speedscope.
+    """
+    output_stem.parent.mkdir(parents=True, exist_ok=True)
+    match profiler:
+        case Profiler.CProfile:
+            output_path = output_stem.with_name(f"{output_stem.name}.pstats")
+            with cProfile.Profile() as profile:
+                result = func(arg)
+            profile.dump_stats(output_path)
+        case Profiler.Sample:
+            output_path = output_stem.with_name(f"{output_stem.name}.collapsed")
+            with _StackSampler(
+                threading.get_ident(), inspect.currentframe()
+            ) as sampler:
+                result = func(arg)
+            output_path.write_text(
+                "".join(f"{stack} {count}\n" for stack, count in sampler.stacks.items())
+            )
+    return result, output_path
@@ -1,21 +1,158 @@
-def partition_range(range_: range, separator: range) -> tuple[range, range, range]:
-    before = range(0)
-    if range_.start < separator.start:
-        before = range(range_.start, min(range_.stop, separator.start))
-
-    overlap = range(0)
-    if range_.start < separator.stop and range_.stop > separator.start:
-        overlap = range(
-            max(range_.start, separator.start), min(range_.stop, separator.stop)
+import bisect
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+class IntervalSet:
+    """Set of integers stored as sorted, disjoint and non-adjacent ranges.
+
+    Membership and overlap queries bisect the range bounds. Set operations walk
+    both sets once. Ranges with a step other than 1 are not supported.
+    """
+
+    __slots__ = ("_starts", "_stops")
+
+    def __init__(self, ranges: Iterable[range] = ()) -> None:
+        starts: list[int] = []
+        stops: list[int] = []
+        for r in sorted((r for r in ranges if r), key=lambda r: r.start):
+            assert r.step == 1, r
+            if stops and r.start <= stops[-1]:
+                stops[-1] = max(stops[-1], r.stop)
+            else:
+                starts.append(r.start)
+                stops.append(r.stop)
+        self._starts = starts
+        self._stops = stops
+
+    @classmethod
+    def _from_sorted(cls, starts: list[int], stops: list[int]) -> IntervalSet:
+        result = cls()
+        result._starts = starts
+        result._stops = stops
+        return result
+
+    def ranges(self) -> Iterator[range]:
+        return (
+            range(start, stop)
+            for start, stop in zip(self._starts, self._stops, strict=True)
+        )
+
+    @property
+    def total_length(self) -> int:
+        return sum(self._stops) - sum(self._starts)
+
+    @property
+    def min(self) -> int:
+        if not self._starts:
+            raise ValueError(self)
+        return self._starts[0]
+
+    @property
+    def max(self) -> int:
+        if not self._stops:
+            raise ValueError(self)
+        return self._stops[-1] - 1
+
+    def __bool__(self) -> bool:
+        return bool(self._starts)
+
+    def __contains__(self, value: int) -> bool:
+        i = bisect.bisect_right(self._starts, value) - 1
+        return i >= 0 and value < self._stops[i]
+
+    def overlaps(self, range_: range) -> bool:
+        if not range_:
+            return False
+        # The last range starting before the end of range_ is the only candidate
+        i = bisect.bisect_left(self._starts, range_.stop) - 1
+        return i >= 0 and self._stops[i] > range_.start
+
+    def union(self, other: IntervalSet) -> IntervalSet:
+        starts: list[int] = []
+        stops: list[int] = []
+        i = j = 0
+        while i < len(self._starts) or j < len(other._starts):
+            # Take the range that starts first and merge it into the last one
+            if j == len(other._starts) or (
+                i < len(self._starts) and self._starts[i] <= other._starts[j]
+            ):
+                start, stop = self._starts[i], self._stops[i]
+                i += 1
+            else:
+                start, stop = other._starts[j], other._stops[j]
+                j += 1
+            if stops and start <= stops[-1]:
+                stops[-1] = max(stops[-1], stop)
+            else:
+                starts.append(start)
+                stops.append(stop)
+        return IntervalSet._from_sorted(starts, stops)
+
+    def intersection(self, other: IntervalSet) -> IntervalSet:
+        starts: list[int] = []
+        stops: list[int] = []
+        i = j = 0
+        while i < len(self._starts) and j < len(other._starts):
+            start = max(self._starts[i], other._starts[j])
+            stop = min(self._stops[i], other._stops[j])
+            if start < stop:
+                starts.append(start)
+                stops.append(stop)
+            # The range that ends first cannot overlap anything further
+            if self._stops[i] < other._stops[j]:
+                i += 1
+            else:
+                j += 1
+        return IntervalSet._from_sorted(starts, stops)
+
+    def complement(self, bounds: range) -> IntervalSet:
+        """Values within ``bounds`` that are not in the set."""
+        gaps: list[range] = []
+        start = bounds.start
+        for r in self.clipped(bounds).ranges():
+            gaps.append(range(start, r.start))
+            start = r.stop
+        gaps.append(range(start, bounds.stop))
+        return IntervalSet(gaps)
+
+    def difference(self, other: IntervalSet) -> IntervalSet:
+        if not self:
+            return self
+        return self.intersection(other.complement(range(self.min, self.max + 1)))
+
+    def clipped(self, bounds: range) -> IntervalSet:
+        """Intersection with a single range, found by bisecting."""
+        if not bounds:
+            return IntervalSet()
+        first = bisect.bisect_right(self._stops, bounds.start)
+        last = bisect.bisect_left(self._starts, bounds.stop)
+        starts = self._starts[first:last]
+        stops = self._stops[first:last]
+        if starts:
+            starts[0] = max(starts[0], bounds.start)
+            stops[-1] = min(stops[-1], bounds.stop)
+        return IntervalSet._from_sorted(starts, stops)
+
+    def shifted(self, offset: int) -> IntervalSet:
+        return IntervalSet._from_sorted(
+            [start + offset for start in self._starts],
+            [stop + offset for stop in self._stops],
         )
 
-    after = range(0)
-    if range_.stop > separator.stop:
-        after = range(max(range_.start, separator.stop), range_.stop)
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
 
-    return before, overlap, after
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, IntervalSet):
+            return self._starts == other._starts and self._stops == other._stops
+        return NotImplemented
 
+    def __hash__(self) -> int:
+        return hash((tuple(self._starts), tuple(self._stops)))
 
-def are_ranges_overlapping(left: range, right: range) -> bool:
-    _, overlap, _ = partition_range(left, right)
-    return bool(overlap)
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self.ranges())})"
@@ -1,9 +1,14 @@
+import contextlib
 import inspect
 import logging
+import os
 import pathlib
 import sys
 from typing import TYPE_CHECKING, Literal, TypeIs
 
+from aoc.tooling.profile import Profiler, call_profiled
+from aoc.tooling.timing import recording
+
 if TYPE_CHECKING:
     from collections.abc import Callable
 
@@ -12,6 +17,10 @@ def is_part(n: int) -> TypeIs[Literal[1, 2]]:
     return n in (1, 2)
 
 
+def get_log_level(verbosity: int) -> int:
+    return {0: logging.WARNING, 1: logging.INFO, 2: logging.DEBUG}[verbosity]
+
+
 def get_logger() -> logging.Logger:
     filename = pathlib.Path(inspect.stack()[1].filename).name
     return logging.getLogger(filename)
@@ -19,15 +28,37 @@ def get_logger() -> logging.Logger:
 
 def run(p1: Callable[[str], int], p2: Callable[[str], int]) -> None:
     verbosity, part = map(int, sys.argv[1:])
-    level = {0: logging.WARNING, 1: logging.INFO, 2: logging.DEBUG}[verbosity]
-    logging.basicConfig(level=level)
+    logging.basicConfig(level=get_log_level(verbosity))
     assert is_part(part)
     input_str = sys.stdin.read().strip()
 
     match part:
         case 1:
-            answer = p1(input_str)
+            part_function = p1
         case 2:
-            answer = p2(input_str)
+            part_function = p2
+
+    phases_enabled = os.environ.get("AOC_PHASES", "") not in ("", "0", "false")
+    with recording() if phases_enabled else contextlib.nullcontext() as timings:
+        answer = _call_part_function(part_function, input_str, part)
+    if timings is not None:
+        print(timings.to_line(), file=sys.stderr)  # noqa: T201
     print(answer)  # noqa: T201
     sys.exit(0)
+
+
+def _call_part_function(
+    part_function: Callable[[str], int], input_str: str, part: int
+) -> int:
+    profiler = os.environ.get("AOC_PROFILE")
+    if profiler:
+        module_name = pathlib.Path(inspect.getfile(part_function)).stem
+        output_stem = pathlib.Path(
+            os.environ.get("AOC_PROFILE_OUTPUT", f"profile-{module_name}-p{part}")
+        )
+        answer, output_path = call_profiled(
+            Profiler(profiler), part_function, input_str, output_stem
+        )
+        logging.getLogger(__name__).warning("Profile written: %s", output_path)
+        return answer
+    return part_function(input_str)
@@ -0,0 +1,187 @@
+"""Breadth-first, Dijkstra and A* searches over states encoded as ints.
+
+States are ``0 <= state < state_count``, e.g. ``y * width + x`` or that times
+the number of directions plus a direction, so distances are kept in a flat list
+rather than a dict of NamedTuples. Neighbors come from a callback that yields
+the next states, and for weighted searches their non-negative weights.
+
+A search stops once it takes the first state of ``goals`` off its queue.
+Distances of states still queued by then may be larger than the shortest.
+"""
+
+import heapq
+from typing import TYPE_CHECKING
+
+from attrs import frozen
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Container, Iterable
+
+UNREACHED = -1
+
+
+class MaxWeightExceededError(ValueError):
+    def __init__(self, weight: int, max_weight: int) -> None:
+        super().__init__(f"move weight {weight} exceeds max_weight {max_weight}")
+
+
+@frozen
+class SearchResult:
+    distances: list[int]
+    """Distance of every state, UNREACHED where the search did not get to."""
+    goal: int | None
+    """The first goal state reached, if any."""
+    visited: int
+    """Number of states whose neighbors were generated."""
+
+    @property
+    def goal_distance(self) -> int | None:
+        if self.goal is None:
+            return None
+        return self.distances[self.goal]
+
+    def distance_to(self, state: int) -> int | None:
+        distance = self.distances[state]
+        return None if distance == UNREACHED else distance
+
+
+def bfs(
+    starts: Iterable[int],
+    neighbors: Callable[[int], Iterable[int]],
+    state_count: int,
+    *,
+    goals: Container[int] = (),
+) -> SearchResult:
+    """Search where every move costs 1."""
+    distances = [UNREACHED] * state_count
+    frontier: list[int] = []
+    for state in starts:
+        if distances[state] == UNREACHED:
+            distances[state] = 0
+            frontier.append(state)
+
+    distance = 0
+    visited = 0
+    while frontier:
+        next_frontier: list[int] = []
+        distance += 1
+        for state in frontier:
+            if state in goals:
+                return SearchResult(distances, state, visited)
+            visited += 1
+            for next_state in neighbors(state):
+                if distances[next_state] == UNREACHED:
+                    distances[next_state] = distance
+                    next_frontier.append(next_state)
+        frontier = next_frontier
+    return SearchResult(distances, None, visited)
+
+
+def dijkstra(
+    starts: Iterable[int],
+    neighbors: Callable[[int], Iterable[tuple[int, int]]],
+    state_count: int,
+    *,
+    goals: Container[int] = (),
+    max_weight: int | None = None,
+) -> SearchResult:
+    """Shortest distances where ``neighbors`` yields ``(state, weight)`` pairs.
+
+    Given the largest weight of a move, the states are queued by Dial's
+    algorithm in a ring of ``max_weight + 1`` buckets instead of a heap, which
+    is faster for the small integer weights of a grid.
+    """
+    if max_weight is not None:
+        return _dial(starts, neighbors, state_count, goals, max_weight)
+    return a_star(starts, neighbors, state_count, _no_estimate, goals=goals)
+
+
+def _no_estimate(_: int) -> int:
+    return 0
+
+
+def _dial(
+    starts: Iterable[int],
+    neighbors: Callable[[int], Iterable[tuple[int, int]]],
+    state_count: int,
+    goals: Container[int],
+    max_weight: int,
+) -> SearchResult:
+    distances = [UNREACHED] * state_count
+    ring = max_weight + 1
+    buckets: list[list[int]] = [[] for _ in range(ring)]
+    queued = 0
+    for state in starts:
+        if distances[state] == UNREACHED:
+            distances[state] = 0
+            buckets[0].append(state)
+            queued += 1
+
+    distance = 0
+    visited = 0
+    while queued:
+        bucket = buckets[distance % ring]
+        pop = bucket.pop
+        while bucket:
+            state = pop()
+            queued -= 1
+            if distances[state] != distance:
+                # Queued again later with a shorter distance
+                continue
+            if state in goals:
+                return SearchResult(distances, state, visited)
+            visited += 1
+            for next_state, weight in neighbors(state):
+                next_distance = distance + weight
+                known_distance = distances[next_state]
+                if known_distance == UNREACHED or next_distance < known_distance:
+                    # A heavier move would wrap around the ring into a bucket
+                    # that is taken off before its distance
+                    if weight > max_weight:
+                        raise MaxWeightExceededError(weight, max_weight)
+                    distances[next_state] = next_distance
+                    buckets[next_distance % ring].append(next_state)
+                    queued += 1
+        distance += 1
+    return SearchResult(distances, None, visited)
+
+
+def a_star(
+    starts: Iterable[int],
+    neighbors: Callable[[int], Iterable[tuple[int, int]]],
+    state_count: int,
+    heuristic: Callable[[int], int],
+    *,
+    goals: Container[int] = (),
+) -> SearchResult:
+    """Dijkstra ordered by distance plus ``heuristic``, the estimated rest.
+
+    The distance to the goal is the shortest when the heuristic never
+    overestimates it.
+    """
+    distances = [UNREACHED] * state_count
+    queue: list[tuple[int, int, int]] = []
+    for state in starts:
+        if distances[state] == UNREACHED:
+            distances[state] = 0
+            heapq.heappush(queue, (heuristic(state), 0, state))
+
+    visited = 0
+    while queue:
+        _, distance, state = heapq.heappop(queue)
+        if distances[state] != distance:
+            # Queued again later with a shorter distance
+            continue
+        if state in goals:
+            return SearchResult(distances, state, visited)
+        visited += 1
+        for next_state, weight in neighbors(state):
+            next_distance = distance + weight
+            known_distance = distances[next_state]
+            if known_distance == UNREACHED or next_distance < known_distance:
+                distances[next_state] = next_distance
+                heapq.heappush(
+                    queue,
+                    (next_distance + heuristic(next_state), next_distance, next_state),
+                )
+    return SearchResult(distances, None, visited)
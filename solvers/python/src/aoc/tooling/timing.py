@@ -0,0 +1,116 @@
+"""Named phase durations and counters of one solver part.
+
+Nothing is recorded unless the part runs inside :func:`recording`. Outside of
+it :func:`phase`, :func:`timed` and :func:`count` only check one global, so
+solvers can stay instrumented.
+
+Phases may nest. A nested phase is recorded as ``outer/inner`` and its
+duration is included in the duration of the enclosing phase.
+"""
+
+import contextlib
+import functools
+import json
+import time
+from typing import TYPE_CHECKING, Any, Self
+
+from attrs import define, field
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
+
+# Prefix of the line that carries the recorded phases on stderr
+PHASES_LINE_PREFIX = "aoc-phases: "
+
+
+@define
+class PhaseTimings:
+    durations: dict[str, float] = field(factory=dict[str, float])
+    counters: dict[str, int] = field(factory=dict[str, int])
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"durations": self.durations, "counters": self.counters}
+
+    def to_line(self) -> str:
+        return PHASES_LINE_PREFIX + json.dumps(self.as_dict())
+
+
+@define
+class _Recorder:
+    timings: PhaseTimings = field(factory=PhaseTimings)
+    stack: list[str] = field(factory=list[str])
+
+
+_recorder: _Recorder | None = None
+
+
+class _Phase:
+    __slots__ = ("_name", "_path", "_recorder", "_start")
+
+    def __init__(self, recorder: _Recorder, name: str) -> None:
+        self._recorder = recorder
+        self._name = name
+        self._path = name
+        self._start = 0.0
+
+    def __enter__(self) -> Self:
+        stack = self._recorder.stack
+        stack.append(self._name)
+        self._path = "/".join(stack)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        duration = time.perf_counter() - self._start
+        self._recorder.stack.pop()
+        durations = self._recorder.timings.durations
+        durations[self._path] = durations.get(self._path, 0.0) + duration
+
+
+_NOT_RECORDING = contextlib.nullcontext()
+
+
+def phase(name: str) -> contextlib.AbstractContextManager[object]:
+    """Record the duration of the ``with`` block as the phase ``name``.
+
+    Entering the same phase again adds to its duration.
+    """
+    if _recorder is None:
+        return _NOT_RECORDING
+    return _Phase(_recorder, name)
+
+
+def timed[**P, R](name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Record the duration of each call of the decorated function as a phase."""
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if _recorder is None:
+                return func(*args, **kwargs)
+            with _Phase(_recorder, name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add ``n`` to the counter ``name``."""
+    if _recorder is None:
+        return
+    counters = _recorder.timings.counters
+    counters[name] = counters.get(name, 0) + n
+
+
+@contextlib.contextmanager
+def recording() -> Generator[PhaseTimings]:
+    """Record phases and counters until exit into the yielded timings."""
+    global _recorder  # noqa: PLW0603 - the disabled check must stay a global lookup
+    assert _recorder is None, "Recording already in progress"
+    _recorder = _Recorder()
+    try:
+        yield _recorder.timings
+    finally:
+        _recorder = None
@@ -0,0 +1,166 @@
+"""Long-lived process running Python solver parts requested by aoc-main.
+
+Requests and responses are single-line JSON objects on stdin and stdout.
+"""
+
+import contextlib
+import importlib
+import io
+import json
+import logging
+import os
+import pathlib
+import resource
+import sys
+import time
+import traceback
+from typing import TYPE_CHECKING, Any
+
+from aoc.tooling.parallel import ENV_SOLVER_CPUS
+from aoc.tooling.profile import Profiler, call_profiled
+from aoc.tooling.run import get_log_level, is_part
+from aoc.tooling.timing import recording
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def _get_part_function(module_name: str, part: int) -> Callable[[str], int | str]:
+    assert is_part(part)
+    module = importlib.import_module(module_name)
+    part_function: Callable[[str], int | str] = getattr(module, f"p{part}")
+    assert callable(part_function)
+    return part_function
+
+
+def _pin_to_cpu(cpu: int) -> None:
+    # Workers serve parts on whatever slot aoc-main assigned, so the affinity is
+    # set again for every request.
+    # Not available on macOS
+    with contextlib.suppress(AttributeError):
+        os.sched_setaffinity(0, {cpu})
+
+
+def _reset_peak_rss() -> bool:
+    # Linux allows resetting the peak resident set size of a process, which gives
+    # the peak of a single part in a worker that has already run others.
+    try:
+        pathlib.Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        return False
+    return True
+
+
+def _read_peak_rss_bytes(usage: resource.struct_rusage, *, was_reset: bool) -> int:
+    if was_reset:
+        for line in pathlib.Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    # Peak of the whole worker lifetime. In bytes on macOS, kilobytes elsewhere.
+    if sys.platform == "darwin":
+        return usage.ru_maxrss
+    return usage.ru_maxrss * 1024
+
+
+def _get_resource_usage(
+    before: resource.struct_rusage,
+    after: resource.struct_rusage,
+    *,
+    peak_rss_was_reset: bool,
+) -> dict[str, Any]:
+    return {
+        "max_rss_bytes": _read_peak_rss_bytes(after, was_reset=peak_rss_was_reset),
+        "user_time": after.ru_utime - before.ru_utime,
+        "system_time": after.ru_stime - before.ru_stime,
+        "minor_page_faults": after.ru_minflt - before.ru_minflt,
+        "major_page_faults": after.ru_majflt - before.ru_majflt,
+        "voluntary_context_switches": after.ru_nvcsw - before.ru_nvcsw,
+        "involuntary_context_switches": after.ru_nivcsw - before.ru_nivcsw,
+    }
+
+
+def _solve(request: dict[str, Any]) -> dict[str, Any]:
+    module_name = request["module"]
+    part = request["part"]
+    verbosity = request["verbosity"]
+    capture_logs = request["capture_logs"]
+    cpu = request["cpu"]
+    cpu_count = request["cpu_count"]
+    profile: dict[str, str] | None = request["profile"]
+    record_phases = request["phases"]
+    input_str = request["input"]
+    assert isinstance(module_name, str)
+    assert isinstance(part, int)
+    assert isinstance(verbosity, int)
+    assert isinstance(capture_logs, bool)
+    assert cpu is None or isinstance(cpu, int)
+    assert cpu_count is None or isinstance(cpu_count, int)
+    assert profile is None or isinstance(profile, dict)
+    assert isinstance(record_phases, bool)
+    assert isinstance(input_str, str)
+
+    if cpu is not None:
+        _pin_to_cpu(cpu)
+    # A solver process gets its share of the CPUs in its environment
+    if cpu_count is None:
+        os.environ.pop(ENV_SOLVER_CPUS, None)
+    else:
+        os.environ[ENV_SOLVER_CPUS] = str(cpu_count)
+
+    part_function = _get_part_function(module_name, part)
+
+    log_buffer = io.StringIO()
+    handler = logging.StreamHandler(log_buffer if capture_logs else sys.stderr)
+    handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    root_logger = logging.getLogger()
+    root_logger.setLevel(get_log_level(verbosity))
+    root_logger.addHandler(handler)
+    try:
+        peak_rss_was_reset = _reset_peak_rss()
+        usage_before = resource.getrusage(resource.RUSAGE_SELF)
+        start_time = time.perf_counter()
+        profile_file = None
+        with recording() if record_phases else contextlib.nullcontext() as timings:
+            if profile is None:
+                answer = part_function(input_str.strip())
+            else:
+                answer, profile_file = call_profiled(
+                    Profiler(profile["profiler"]),
+                    part_function,
+                    input_str.strip(),
+                    pathlib.Path(profile["output"]),
+                )
+        duration = time.perf_counter() - start_time
+        usage_after = resource.getrusage(resource.RUSAGE_SELF)
+    finally:
+        root_logger.removeHandler(handler)
+
+    return {
+        "answer": str(answer),
+        "duration": duration,
+        "logs": log_buffer.getvalue().splitlines() if capture_logs else None,
+        "resources": _get_resource_usage(
+            usage_before, usage_after, peak_rss_was_reset=peak_rss_was_reset
+        ),
+        "profile_file": None if profile_file is None else str(profile_file),
+        "phases": None if timings is None else timings.as_dict(),
+    }
+
+
+def main() -> None:
+    # Solvers may print while debugging. Keep the protocol stream clean by sending
+    # anything else written to stdout to stderr instead.
+    protocol_out = sys.stdout
+    sys.stdout = sys.stderr
+
+    while line := sys.stdin.readline():
+        try:
+            response = _solve(json.loads(line))
+        except Exception:  # noqa: BLE001 - reported to aoc-main as solver failure
+            response = {"error": traceback.format_exc()}
+        protocol_out.write(json.dumps(response) + "\n")
+        protocol_out.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,11 @@
-from typing import TYPE_CHECKING
+import bisect
+import functools
 
-from attrs import Factory, define, field
+from attrs import Factory, define, field, frozen
 
-from aoc.tooling.ranges import are_ranges_overlapping, partition_range
+from aoc.tooling.ranges import IntervalSet
 from aoc.tooling.run import get_logger, run
 
-if TYPE_CHECKING:
-    from collections.abc import Iterable
-
 _logger = get_logger()
 
 
@@ -80,37 +78,97 @@ def _parse_input(lines: list[str]) -> tuple[list[int], _InputMaps]:
     return seeds, maps
 
 
-def _get_location(maps: _InputMaps, seed: int) -> int:
-    def get_destination(mappings: list[_RangeMap], source: int) -> int:
-        for mapping in mappings:
-            if source < mapping.source_start or source >= (
-                mapping.source_start + mapping.length
-            ):
-                continue
-
-            offset = source - mapping.source_start
-            return mapping.destination_start + offset
-
-        return source
-
-    return get_destination(
+@frozen
+class _PiecewiseOffset:
+    """Maps a value ``v`` to ``v + offsets[i]`` where ``starts[i] <= v``.
+
+    ``starts`` are sorted, begin at 0 and the last piece has no end. Values not
+    covered by any range map of a layer are in pieces with offset 0.
+    """
+
+    starts: list[int]
+    offsets: list[int]
+
+    @classmethod
+    def from_range_maps(cls, mappings: list[_RangeMap]) -> _PiecewiseOffset:
+        starts = [0]
+        offsets = [0]
+        for mapping in sorted(mappings, key=lambda m: m.source_start):
+            offset = mapping.destination_start - mapping.source_start
+            if mapping.source_start > starts[-1]:
+                starts.append(mapping.source_start)
+                offsets.append(offset)
+            else:
+                assert mapping.source_start == starts[-1], "Overlapping range maps"
+                offsets[-1] = offset
+            starts.append(mapping.source_start + mapping.length)
+            offsets.append(0)
+        return cls._merged(starts, offsets)
+
+    @classmethod
+    def _merged(cls, starts: list[int], offsets: list[int]) -> _PiecewiseOffset:
+        # Neighboring pieces with the same offset are one piece
+        merged_starts = [starts[0]]
+        merged_offsets = [offsets[0]]
+        for start, offset in zip(starts[1:], offsets[1:], strict=True):
+            if offset != merged_offsets[-1]:
+                merged_starts.append(start)
+                merged_offsets.append(offset)
+        return cls(merged_starts, merged_offsets)
+
+    def _piece_index(self, value: int) -> int:
+        return bisect.bisect_right(self.starts, value) - 1
+
+    def __call__(self, value: int) -> int:
+        return value + self.offsets[self._piece_index(value)]
+
+    def then(self, other: _PiecewiseOffset) -> _PiecewiseOffset:
+        """Compose: map by this function and the result by ``other``."""
+        starts: list[int] = []
+        offsets: list[int] = []
+        for i, (start, offset) in enumerate(
+            zip(self.starts, self.offsets, strict=True)
+        ):
+            stop = self.starts[i + 1] if i + 1 < len(self.starts) else None
+            # The pieces of other that the image of this piece falls into
+            j = other._piece_index(start + offset)
+            while True:
+                starts.append(max(start, other.starts[j] - offset))
+                offsets.append(offset + other.offsets[j])
+                j += 1
+                if j == len(other.starts) or (
+                    stop is not None and other.starts[j] - offset >= stop
+                ):
+                    break
+        return self._merged(starts, offsets)
+
+    def map_ranges(self, values: IntervalSet) -> IntervalSet:
+        mapped: list[range] = []
+        for r in values.ranges():
+            i = self._piece_index(r.start)
+            start = r.start
+            while start < r.stop:
+                stop = r.stop
+                if i + 1 < len(self.starts):
+                    stop = min(stop, self.starts[i + 1])
+                mapped.append(range(start + self.offsets[i], stop + self.offsets[i]))
+                start = stop
+                i += 1
+        return IntervalSet(mapped)
+
+
+def _compose_layers(maps: _InputMaps) -> _PiecewiseOffset:
+    layers = [
+        maps.seed_to_soil_map,
+        maps.soil_to_fertilizer_map,
+        maps.fertilizer_to_water_map,
+        maps.water_to_light_map,
+        maps.light_to_temperature_map,
+        maps.temperature_to_humidity_map,
         maps.humidity_to_location_map,
-        get_destination(
-            maps.temperature_to_humidity_map,
-            get_destination(
-                maps.light_to_temperature_map,
-                get_destination(
-                    maps.water_to_light_map,
-                    get_destination(
-                        maps.fertilizer_to_water_map,
-                        get_destination(
-                            maps.soil_to_fertilizer_map,
-                            get_destination(maps.seed_to_soil_map, seed),
-                        ),
-                    ),
-                ),
-            ),
-        ),
+    ]
+    return functools.reduce(
+        _PiecewiseOffset.then, map(_PiecewiseOffset.from_range_maps, layers)
     )
 
 
@@ -119,86 +177,9 @@ def p1(input_str: str) -> int:
     _logger.debug("seeds=%s", seeds)
     _logger.debug("maps=%s", maps)
 
-    return min(_get_location(maps, seed) for seed in seeds)
-
-
-def _resolve_overlap(
-    overlap_source: range,
-    dest_overlap: range,
-    next_ind: int,
-    max_ind: int,
-    mapping_ranges: list[list[tuple[range, range]]],
-) -> Iterable[tuple[range, range]]:
-    for resolved_source, top_level_source in _resolve_ranges(
-        overlap_source, next_ind, max_ind, mapping_ranges
-    ):
-        resolved_offset_start = resolved_source.start - overlap_source.start
-        resolved_offset_stop = overlap_source.stop - resolved_source.stop
-        resolved_dest_start = dest_overlap.start + resolved_offset_start
-        resolved_dest_stop = dest_overlap.stop - resolved_offset_stop
-        assert resolved_dest_start < resolved_dest_stop
-
-        yield range(resolved_dest_start, resolved_dest_stop), top_level_source
-
-
-def _resolve_ranges(
-    dest_range_for_ind: range,
-    ind: int,
-    max_ind: int,
-    mapping_ranges: list[list[tuple[range, range]]],
-    mapping_start_index: int | None = None,
-) -> Iterable[tuple[range, range]]:
-    assert ind <= max_ind
-
-    if mapping_start_index is None:
-        mapping_start_index = 0
-
-    for mapping_range_ind, ranges in enumerate(
-        mapping_ranges[ind], mapping_start_index
-    ):
-        mapping_dest_range, mapping_source_range = ranges
-
-        (
-            dest_before,
-            dest_overlap,
-            dest_after,
-        ) = partition_range(dest_range_for_ind, mapping_dest_range)
-
-        if not dest_overlap:
-            assert bool(dest_before) != bool(dest_after)
-            continue
-
-        if dest_before:
-            yield from _resolve_ranges(
-                dest_before, ind, max_ind, mapping_ranges, mapping_range_ind + 1
-            )
-
-        overlap_offset_start = dest_overlap.start - mapping_dest_range.start
-        overlap_offset_stop = mapping_dest_range.stop - dest_overlap.stop
-        overlap_source_start = mapping_source_range.start + overlap_offset_start
-        overlap_source_stop = mapping_source_range.stop - overlap_offset_stop
-        assert overlap_source_start < overlap_source_stop
-
-        overlap_source = range(overlap_source_start, overlap_source_stop)
-
-        if ind == max_ind:
-            yield dest_overlap, overlap_source
-        else:
-            yield from _resolve_overlap(
-                overlap_source, dest_overlap, ind + 1, max_ind, mapping_ranges
-            )
-
-        if dest_after:
-            yield from _resolve_ranges(
-                dest_after, ind, max_ind, mapping_ranges, mapping_range_ind + 1
-            )
-
-        return
-
-    if ind == max_ind:
-        yield dest_range_for_ind, dest_range_for_ind
-    else:
-        yield from _resolve_ranges(dest_range_for_ind, ind + 1, max_ind, mapping_ranges)
+    seed_to_location = _compose_layers(maps)
+    _logger.info("Composed into %d pieces", len(seed_to_location.starts))
+    return min(map(seed_to_location, seeds))
 
 
 def p2(input_str: str) -> int:
@@ -206,50 +187,14 @@ def p2(input_str: str) -> int:
 
     seed_starts = seed_data[0::2]
     seed_lengths = seed_data[1::2]
-    seed_ranges = [
+    seed_ranges = IntervalSet(
         range(start, start + length)
         for start, length in zip(seed_starts, seed_lengths, strict=True)
-    ]
-
-    maps.humidity_to_location_map.sort(key=lambda m: m.destination_start)
-
-    mapping_ranges = [
-        [
-            (
-                range(
-                    mapping.destination_start,
-                    mapping.destination_start + mapping.length,
-                ),
-                range(mapping.source_start, mapping.source_start + mapping.length),
-            )
-            for mapping in mappings
-        ]
-        for mappings in [
-            maps.humidity_to_location_map,
-            maps.temperature_to_humidity_map,
-            maps.light_to_temperature_map,
-            maps.water_to_light_map,
-            maps.fertilizer_to_water_map,
-            maps.soil_to_fertilizer_map,
-            maps.seed_to_soil_map,
-        ]
-    ]
-    max_ind = len(mapping_ranges) - 1
-
-    location_dest_ranges = [dest_range for dest_range, _ in mapping_ranges[0]]
-    if location_dest_ranges[0].start > 0:
-        location_dest_ranges.insert(0, range(location_dest_ranges[0].start))
+    )
 
-    for initial_dest_range in location_dest_ranges:
-        for resolved_location_range, resolved_seed_range in _resolve_ranges(
-            initial_dest_range, 0, max_ind, mapping_ranges
-        ):
-            if any(
-                are_ranges_overlapping(resolved_seed_range, seed_range)
-                for seed_range in seed_ranges
-            ):
-                return resolved_location_range.start
-    raise AssertionError
+    seed_to_location = _compose_layers(maps)
+    _logger.info("Composed into %d pieces", len(seed_to_location.starts))
+    return seed_to_location.map_ranges(seed_ranges).min
 
 
 if __name__ == "__main__":
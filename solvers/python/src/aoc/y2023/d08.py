@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING
 
 from attrs import define
 
+from aoc.tooling.cycles import CycleDetector
 from aoc.tooling.run import get_logger, run
 
 if TYPE_CHECKING:
@@ -120,27 +121,18 @@ def _resolve_loop_length(
 ) -> int:
     directions_len = len(directions)
     turns = itertools.cycle(directions)
-    visit_keys: set[tuple[int, int]] = set()
+    detector = CycleDetector[tuple[int, int]]()
     path: list[int] = [start_location]
 
     # Find loop: when second time in same location at same direction
     # same direction means index inside directions string, not the direction value (L/R)
-    while True:
-        visit_key = (path[-1], (len(visit_keys)) % directions_len)
-        if visit_key in visit_keys:
-            # Loop found
-            break
-
-        visit_keys.add(visit_key)
-
+    while (cycle := detector.add((path[-1], (len(path) - 1) % directions_len))) is None:
         turn_to_take = next(turns)
         cur_location = map_data.map_nodes[path[-1]][0 if turn_to_take == "L" else 1]
         path.append(cur_location)
 
-    loop_start_ind = path.index(path[-1])
-
-    path_before_loop = path[:loop_start_ind]
-    loop_path = path[loop_start_ind:-1]
+    path_before_loop = path[: cycle.prefix_length]
+    loop_path = path[cycle.prefix_length : cycle.prefix_length + cycle.period]
 
     return _get_verified_loop_length(path_before_loop, loop_path, map_data)
 
@@ -5,6 +5,8 @@ from typing import TYPE_CHECKING
 
 from attrs import define, field
 
+from aoc.tooling import timing
+from aoc.tooling.bitsets import GridBitset
 from aoc.tooling.coordinates import Coord2d, X, Y
 from aoc.tooling.directions import CardinalDirection as Dir
 from aoc.tooling.directions import CardinalDirectionsAll
@@ -12,7 +14,7 @@ from aoc.tooling.map import Map2d
 from aoc.tooling.run import get_logger, run
 
 if TYPE_CHECKING:
-    from collections.abc import Collection, Iterable
+    from collections.abc import Iterable
 
 _logger = get_logger()
 
@@ -106,7 +108,8 @@ def _get_adjoin_pipes_on_path(pipe: _Pipe, map_data: _MapData) -> Iterable[_Pipe
 
 
 def p1(input_str: str) -> int:
-    map_data = _MapData(list(input_str.splitlines()))
+    with timing.phase("parse"):
+        map_data = _MapData(list(input_str.splitlines()))
 
     start = map_data.start
     neighbors_cur = list(_get_adjoin_pipes_on_path(start, map_data))
@@ -115,14 +118,15 @@ def p1(input_str: str) -> int:
     neighbors_prev = [start, start]
 
     dist = 1
-    while neighbors_cur[0] != neighbors_cur[1]:
-        neighbors_new = [
-            next(n for n in _get_adjoin_pipes_on_path(cur, map_data) if n != prev)
-            for prev, cur in zip(neighbors_prev, neighbors_cur, strict=True)
-        ]
-        neighbors_prev = neighbors_cur
-        neighbors_cur = neighbors_new
-        dist += 1
+    with timing.phase("walk"):
+        while neighbors_cur[0] != neighbors_cur[1]:
+            neighbors_new = [
+                next(n for n in _get_adjoin_pipes_on_path(cur, map_data) if n != prev)
+                for prev, cur in zip(neighbors_prev, neighbors_cur, strict=True)
+            ]
+            neighbors_prev = neighbors_cur
+            neighbors_cur = neighbors_new
+            dist += 1
 
     return dist
 
@@ -168,16 +172,13 @@ class _PathPipe:
     neighbors: dict[Dir, _Inside]
 
 
-def _create_first_path_pipe(
-    map_data: _MapData, coords_in_path: Collection[Coord2d]
-) -> _PathPipe:
+def _create_first_path_pipe(map_data: _MapData, path: GridBitset) -> _PathPipe:
     # Guessed value for y to hit path on | symbol
     y = Y((map_data.height // 2) + 1)
 
     for _, x_iter in map_data.iter_data_by_lines(y, X(0), Y(y + 1), map_data.br_x):
         for _, pipe in x_iter:
-            coord = pipe.coord
-            if coord not in coords_in_path:
+            if not path.contains(pipe.coord.y, pipe.coord.x):
                 assert pipe.inside is _Inside.Unknown
                 pipe.inside = _Inside.Outside
             else:
@@ -185,7 +186,7 @@ def _create_first_path_pipe(
                 assert pipe.symbol == "|", "Use better value for y"
                 adjoin_coord = pipe.coord.adjoin(Dir.E)
                 east_neighbor = map_data.get(adjoin_coord.y, adjoin_coord.x)
-                if east_neighbor and east_neighbor.coord not in coords_in_path:
+                if east_neighbor and not path.contains(adjoin_coord.y, adjoin_coord.x):
                     east_neighbor.inside = _Inside.Inside
                 return _PathPipe(pipe, {Dir.E: _Inside.Inside, Dir.W: _Inside.Outside})
     raise AssertionError
@@ -350,7 +351,8 @@ def mark_pipes(map_data: _MapData) -> None:
 
 
 def p2(input_str: str) -> int:
-    map_data = _MapData(list(input_str.splitlines()))
+    with timing.phase("parse"):
+        map_data = _MapData(list(input_str.splitlines()))
 
     start = map_data.start
     start_neighbors = list(_get_adjoin_pipes_on_path(start, map_data))
@@ -359,24 +361,29 @@ def p2(input_str: str) -> int:
     _logger.debug("fixed_start_symbol=%s", fixed_start_symbol)
     start.symbol = fixed_start_symbol
 
-    path_by_pipes = _create_path_by_pipes(start, start_neighbors[0], map_data)
+    with timing.phase("path"):
+        path_by_pipes = _create_path_by_pipes(start, start_neighbors[0], map_data)
+    timing.count("path_pipes", len(path_by_pipes))
 
-    coords_in_path = {pipe.coord for pipe in path_by_pipes}
-    first_path_pipe = _create_first_path_pipe(map_data, coords_in_path)
+    path = GridBitset(map_data.height, map_data.width)
+    path.update(path.index(pipe.coord.y, pipe.coord.x) for pipe in path_by_pipes)
+    first_path_pipe = _create_first_path_pipe(map_data, path)
     _logger.debug("first_path_pipe=%s", first_path_pipe)
 
     _logger.info("Detecting inside/outside neighbors along path")
-    index_in_path_for_first_path_pipe = path_by_pipes.index(first_path_pipe.pipe)
-    prev_path_pipe: _PathPipe = first_path_pipe
-    for pipe in itertools.chain(
-        path_by_pipes[index_in_path_for_first_path_pipe + 1 :],
-        path_by_pipes[:index_in_path_for_first_path_pipe],
-    ):
-        prev_path_pipe = create_path_pipe(prev_path_pipe, pipe, map_data)
+    with timing.phase("path_neighbors"):
+        index_in_path_for_first_path_pipe = path_by_pipes.index(first_path_pipe.pipe)
+        prev_path_pipe: _PathPipe = first_path_pipe
+        for pipe in itertools.chain(
+            path_by_pipes[index_in_path_for_first_path_pipe + 1 :],
+            path_by_pipes[:index_in_path_for_first_path_pipe],
+        ):
+            prev_path_pipe = create_path_pipe(prev_path_pipe, pipe, map_data)
 
     _logger.info("Marking rest of map for inside/outside")
 
-    mark_pipes(map_data)
+    with timing.phase("mark"):
+        mark_pipes(map_data)
 
     def log_map(map_data: _MapData) -> None:
         def get_symbol_for_pipe(pipe: _Pipe) -> str:
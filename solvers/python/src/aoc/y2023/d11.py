@@ -1,62 +1,39 @@
-import contextlib
-from typing import TYPE_CHECKING
-
-from aoc.tooling.coordinates import Coord2d
-from aoc.tooling.map import Map2d
+from aoc.tooling.grid import Grid2d
 from aoc.tooling.run import run
 
-if TYPE_CHECKING:
-    from collections.abc import Iterable
-
-
-class _InputMap(Map2d):
-    def __init__(self, data: Iterable[str]) -> None:
-        super().__init__(list(data))
+_GALAXY = b"#"
 
 
-def _calculate_distance(
-    coord1: Coord2d,
-    coord2: Coord2d,
-    expansion_indices_x: set[int],
-    expansion_indices_y: set[int],
-    expansion_distance: int,
-) -> int:
-    min_x = min(coord1.x, coord2.x)
-    max_x = max(coord1.x, coord2.x)
-    min_y = min(coord1.y, coord2.y)
-    max_y = max(coord1.y, coord2.y)
-    distance = max_x - min_x + max_y - min_y
-    traveled_x_indices = set(range(min_x + 1, max_x))
-    traveled_y_indices = set(range(min_y + 1, max_y))
+def _axis_distance_sum(galaxy_counts: list[int], expansion_distance: int) -> int:
+    """Sum the distances along one axis between all pairs of galaxies.
 
-    distance += len(traveled_x_indices & expansion_indices_x) * (expansion_distance - 1)
-    distance += len(traveled_y_indices & expansion_indices_y) * (expansion_distance - 1)
-
-    return distance
+    ``galaxy_counts`` has the number of galaxies on each line of the axis. A
+    line without galaxies expands to ``expansion_distance`` lines. The lines are
+    walked in order, keeping the count and the position sum of the galaxies
+    already passed, so each galaxy adds its distance to all of them at once.
+    """
+    total = 0
+    position = 0
+    galaxies_before = 0
+    positions_before = 0
+    for count in galaxy_counts:
+        if not count:
+            position += expansion_distance
+            continue
+        total += count * (galaxies_before * position - positions_before)
+        galaxies_before += count
+        positions_before += count * position
+        position += 1
+    return total
 
 
 def calculate_distance_between_galaxies(input_str: str, expansion_distance: int) -> int:
-    input_map = _InputMap(input_str.splitlines())
-    empty_x_indices = set(range(input_map.width))
-    empty_y_indices = set(range(input_map.height))
-    galaxy_coords: list[Coord2d] = []
-    # filter(lambda d: d[1] == "#",
-    iter_ = (
-        (y, x) for y, x_iter in input_map.iter_data() for x, sym in x_iter if sym == "#"
-    )
-    for y, x in iter_:
-        with contextlib.suppress(KeyError):
-            empty_x_indices.remove(x)
-        with contextlib.suppress(KeyError):
-            empty_y_indices.remove(y)
-        galaxy_coords.append(Coord2d(y, x))
-
-    return sum(
-        _calculate_distance(
-            coord, other_coord, empty_x_indices, empty_y_indices, expansion_distance
-        )
-        for first_ind, coord in enumerate(galaxy_coords[:-1])
-        for other_coord in galaxy_coords[first_ind + 1 :]
+    # Manhattan distances split into independent sums along the rows and columns
+    grid = Grid2d.from_lines(input_str.splitlines())
+    return _axis_distance_sum(
+        [row.count(_GALAXY) for row in grid.rows()], expansion_distance
+    ) + _axis_distance_sum(
+        [column.count(_GALAXY) for column in grid.columns()], expansion_distance
     )
 
 
@@ -1,159 +1,160 @@
-from aoc.tooling.coordinates import Coord2d, X, Y
+from attrs import frozen
+
+from aoc.tooling.bitsets import GridBitset
+from aoc.tooling.digraph import Arc, Digraph, DigraphCreator
 from aoc.tooling.directions import CardinalDirection as Dir
-from aoc.tooling.map import Map2d
+from aoc.tooling.directions import CardinalDirectionsAll
 from aoc.tooling.run import get_logger, run
 
 _logger = get_logger()
 
-
-class _SplitterExitCache:
-    __slots__ = ("_cache",)
-
-    def __init__(self) -> None:
-        self._cache: dict[
-            tuple[Coord2d, Dir], tuple[set[Coord2d], list[tuple[Coord2d, Dir]]]
-        ] = {}
-
-    def get(
-        self, coord: Coord2d, dir_: Dir
-    ) -> tuple[set[Coord2d], list[tuple[Coord2d, Dir]]] | None:
-        return self._cache.get((coord, dir_))
-
-    def add(
-        self,
-        coord: Coord2d,
-        dir_: Dir,
-        visited: set[Coord2d],
-        next_splitter_exits: list[tuple[Coord2d, Dir]],
-    ) -> None:
-        assert (coord, dir_) not in self._cache
-        self._cache[(coord, dir_)] = (visited, next_splitter_exits)
-
-
-def _process_splitter_exit(
-    coord: Coord2d, dir_: Dir, map_: Map2d
-) -> tuple[set[Coord2d], list[tuple[Coord2d, Dir]]]:
-    visited: set[Coord2d] = set()
-    next_splitter_exits: list[tuple[Coord2d, Dir]] = []
-    while True:
-        if (
-            coord.x < map_.tl_x
-            or coord.x > map_.br_x
-            or coord.y < map_.tl_y
-            or coord.y > map_.br_y
-        ):
-            _logger.debug("Out of map")
-            break
-        visited.add(coord)
-
-        symbol = map_.get(coord.y, coord.x)
-        _logger.debug("Coord: %s Dir: %s Symbol: %s", coord, dir_, symbol)
-
-        if symbol == ".":
-            coord = coord.adjoin(dir_)
-            continue
-
-        if symbol == "/":
-            dir_ = (
-                dir_.rotate_clockwise()
-                if dir_ in (Dir.N, Dir.S)
-                else dir_.rotate_counterclockwise()
-            )
-            coord = coord.adjoin(dir_)
-            continue
-
-        if symbol == "\\":
-            dir_ = (
-                dir_.rotate_counterclockwise()
-                if dir_ in (Dir.N, Dir.S)
-                else dir_.rotate_clockwise()
-            )
-            coord = coord.adjoin(dir_)
-            continue
-
-        if symbol == "-":
-            if dir_ in (Dir.N, Dir.S):
-                next_splitter_exits.extend(
-                    [(coord.adjoin(Dir.E), Dir.E), (coord.adjoin(Dir.W), Dir.W)]
-                )
-            else:
-                next_splitter_exits.append((coord.adjoin(dir_), dir_))
-            break
-
-        if symbol == "|":
-            if dir_ in (Dir.E, Dir.W):
-                next_splitter_exits.extend(
-                    [(coord.adjoin(Dir.N), Dir.N), (coord.adjoin(Dir.S), Dir.S)]
-                )
-            else:
-                next_splitter_exits.append((coord.adjoin(dir_), dir_))
-            break
-    return visited, next_splitter_exits
-
-
-def _try_one_enter(
-    enter_coord: Coord2d,
-    enter_dir: Dir,
-    map_: Map2d,
-    exit_cache: _SplitterExitCache,
-) -> int:
-    visited: set[Coord2d] = set()
-    processed_splitter_exits: set[tuple[Coord2d, Dir]] = set()
-    processing_queue: list[tuple[Coord2d, Dir]] = [(enter_coord, enter_dir)]
-
-    while processing_queue:
-        coord, dir_ = processing_queue.pop(0)
-        _logger.debug("Start processing %s -> %s", coord, dir_)
-        if (coord, dir_) in processed_splitter_exits:
-            _logger.debug("Already processed")
-            continue
-        processed_splitter_exits.add((coord, dir_))
-        _logger.debug("Visited count so far: %d", len(visited))
-
-        cached = exit_cache.get(coord, dir_)
-        if cached is not None:
-            _logger.debug("Cache hit")
-            processed_visited, next_splitter_exits = cached
+# Direction indices, clockwise from north
+_N, _E, _S, _W = (CardinalDirectionsAll.index(d) for d in (Dir.N, Dir.E, Dir.S, Dir.W))
+_DIRECTION_COUNT = len(CardinalDirectionsAll)
+
+_SLASH_TURNS = {_N: _E, _E: _N, _S: _W, _W: _S}
+_BACKSLASH_TURNS = {_N: _W, _W: _N, _S: _E, _E: _S}
+
+
+@frozen
+class _Contraption:
+    """Tiles indexed by ``y * width + x``.
+
+    A beam state is ``tile * 4 + direction``: the beam is on the tile, about to
+    be redirected by it, heading in the direction.
+    """
+
+    height: int
+    width: int
+    tiles: str
+
+    @classmethod
+    def parse(cls, input_str: str) -> _Contraption:
+        lines = input_str.splitlines()
+        return cls(len(lines), len(lines[0]), "".join(lines))
+
+    def edge_entries(self) -> list[int]:
+        last_row = (self.height - 1) * self.width
+        return [
+            *((x * _DIRECTION_COUNT + _S) for x in range(self.width)),
+            *(((last_row + x) * _DIRECTION_COUNT + _N) for x in range(self.width)),
+            *((y * self.width * _DIRECTION_COUNT + _E) for y in range(self.height)),
+            *(
+                ((y * self.width + self.width - 1) * _DIRECTION_COUNT + _W)
+                for y in range(self.height)
+            ),
+        ]
+
+    def _next_state(self, tile: int, direction: int) -> int | None:
+        y, x = divmod(tile, self.width)
+        if direction == _N and y > 0:
+            tile -= self.width
+        elif direction == _E and x < self.width - 1:
+            tile += 1
+        elif direction == _S and y < self.height - 1:
+            tile += self.width
+        elif direction == _W and x > 0:
+            tile -= 1
         else:
-            processed_visited, next_splitter_exits = _process_splitter_exit(
-                coord, dir_, map_
-            )
-            exit_cache.add(coord, dir_, processed_visited, next_splitter_exits)
-        visited |= processed_visited
-        processing_queue.extend(next_splitter_exits)
-    return len(visited)
+            return None
+        return tile * _DIRECTION_COUNT + direction
+
+    def follow_beam(self, state: int) -> tuple[GridBitset, list[int]]:
+        """Energised tiles and the beams leaving the next splitter."""
+        tiles: list[int] = []
+        next_states: list[int] = []
+        while True:
+            tile, direction = divmod(state, _DIRECTION_COUNT)
+            tiles.append(tile)
+            match self.tiles[tile]:
+                case "/":
+                    directions = [_SLASH_TURNS[direction]]
+                case "\\":
+                    directions = [_BACKSLASH_TURNS[direction]]
+                case "-" if direction in (_N, _S):
+                    directions = [_E, _W]
+                case "|" if direction in (_E, _W):
+                    directions = [_N, _S]
+                case _:
+                    directions = [direction]
+            if self.tiles[tile] in "-|":
+                # Beams from splitters are followed on their own
+                for new_direction in directions:
+                    next_state = self._next_state(tile, new_direction)
+                    if next_state is not None:
+                        next_states.append(next_state)
+                break
+            next_state = self._next_state(tile, directions[0])
+            if next_state is None:
+                break
+            state = next_state
+        energised = GridBitset(self.height, self.width)
+        energised.update(tiles)
+        return energised, next_states
+
+
+def _follow_all_beams(
+    contraption: _Contraption, entries: list[int]
+) -> Digraph[int, GridBitset]:
+    """Beam graph of the states at the entries and at splitter exits.
+
+    Each node holds the tiles its beam energises before the next splitter and
+    has arcs to the beams leaving that splitter.
+    """
+    segments: dict[int, tuple[GridBitset, list[int]]] = {}
+    pending = list(dict.fromkeys(entries))
+    while pending:
+        state = pending.pop()
+        if state not in segments:
+            segments[state] = contraption.follow_beam(state)
+            pending.extend(segments[state][1])
+
+    creator = DigraphCreator[int, GridBitset]()
+    for state, (energised, _) in segments.items():
+        creator.add_node(state, energised)
+    for state, (_, next_states) in segments.items():
+        for next_state in next_states:
+            creator.add_arc(Arc(state, next_state))
+    return creator.create()
+
+
+def _energised_counts(contraption: _Contraption, entries: list[int]) -> list[int]:
+    """Count the tiles energised from each entry.
+
+    Loops between splitters collapse into strongly connected components of the
+    beam graph. The tiles energised from a component are the OR of its own
+    bitsets and those of the components it leads to.
+    """
+    beams = _follow_all_beams(contraption, entries)
+    components = beams.condensation()
+    energised: dict[int, GridBitset] = {}
+    # Later components are complete before the ones leading to them
+    for i in reversed(range(len(components.nodes))):
+        tiles = GridBitset(contraption.height, contraption.width)
+        for state in components.nodes[i]:
+            tiles |= beams.nodes[state]
+        for arc in components.get_arcs_from(i):
+            tiles |= energised[arc.to]
+        energised[i] = tiles
+    component_indices = {
+        state: i for i, states in components.nodes.items() for state in states
+    }
+    _logger.debug("%d beams in %d components", len(beams.nodes), len(energised))
+    return [len(energised[component_indices[entry]]) for entry in entries]
 
 
 def p1(input_str: str) -> int:
-    map_ = Map2d(input_str.splitlines())
-    exit_cache = _SplitterExitCache()
-    return _try_one_enter(Coord2d(map_.tl_y, map_.tl_x), Dir.E, map_, exit_cache)
+    contraption = _Contraption.parse(input_str)
+    return _energised_counts(contraption, [_E])[0]
 
 
 def p2(input_str: str) -> int:
-    map_ = Map2d(input_str.splitlines())
-    exit_cache = _SplitterExitCache()
-    results: list[tuple[Coord2d, Dir, int]] = []
-
-    for x1 in range(map_.tl_x, map_.br_x + 1):
-        for y1 in (map_.tl_y, map_.br_y):
-            coord = Coord2d(y1, X(x1))
-            dir_ = Dir.S if y1 == 0 else Dir.N
-            _logger.info("Trying %s -> %s", coord, dir_)
-            result = _try_one_enter(coord, dir_, map_, exit_cache)
-            _logger.info("Result %s -> %s = %d", coord, dir_, result)
-            results.append((coord, dir_, result))
-    for y2 in range(map_.tl_y, map_.br_y + 1):
-        for x2 in (map_.tl_x, map_.br_x):
-            coord = Coord2d(Y(y2), x2)
-            dir_ = Dir.E if x2 == 0 else Dir.W
-            _logger.info("Trying %s -> %s", coord, dir_)
-            result = _try_one_enter(coord, dir_, map_, exit_cache)
-            _logger.info("Result %s -> %s = %d", coord, dir_, result)
-            results.append((coord, dir_, result))
-
-    results.sort(key=lambda r: r[2])
-    return results[-1][2]
+    contraption = _Contraption.parse(input_str)
+    entries = contraption.edge_entries()
+    counts = _energised_counts(contraption, entries)
+    best = max(range(len(entries)), key=counts.__getitem__)
+    _logger.info("Best entry state %d: %d", entries[best], counts[best])
+    return counts[best]
 
 
 if __name__ == "__main__":
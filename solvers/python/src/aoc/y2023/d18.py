@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING
 
 from attrs import define, field
 
+from aoc.tooling import timing
 from aoc.tooling.coordinates import Coord2d, X, Y
 from aoc.tooling.directions import CardinalDirection as Dir
 from aoc.tooling.run import get_logger, run
@@ -317,13 +318,19 @@ class _InsideCountGroups:
 
 
 def _resolve(dir_counts: Iterable[tuple[Dir, int]]) -> int:
-    path = _Path()
-    path.process(dir_counts)
-    path.normalize()
-
-    segments = _PathLines(path)
-    segment_groups = _InsideCountGroups(segments)
-    return segment_groups.total_inside_positions()
+    with timing.phase("path"):
+        path = _Path()
+        path.process(dir_counts)
+        path.normalize()
+    timing.count("corners", len(path.corners))
+
+    with timing.phase("lines"):
+        segments = _PathLines(path)
+
+    with timing.phase("count"):
+        segment_groups = _InsideCountGroups(segments)
+        timing.count("unique_rows", len(segment_groups.unique_rows))
+        return segment_groups.total_inside_positions()
 
 
 def p1(input_str: str) -> int:
@@ -1,14 +1,13 @@
 import itertools
-import logging
-import math
 import re
-from collections.abc import Iterable, Mapping
+from collections.abc import Iterable, Iterator, Mapping
 from enum import Enum
-from queue import Queue
-from typing import Literal, NewType, TypeIs, cast
+from typing import Literal, NewType, TypeIs
 
-from attrs import define, frozen
+from attrs import frozen
 
+from aoc.tooling.boxes import Box
+from aoc.tooling.digraph import Arc, DigraphCreator
 from aoc.tooling.run import get_logger, run
 
 _logger = get_logger()
@@ -115,48 +114,73 @@ def _parse_input(input_str: str) -> tuple[dict[str, _Workflow], Iterable[_Part]]
     return workflows, map(_parse_part, input_line_iter)
 
 
-def _process_part(
-    in_workflow: _Workflow, workflows: dict[str, _Workflow], part: _Part
-) -> bool:
-    def _lt(left: int, right: int) -> bool:
-        return left < right
+# Axis of each category in the boxes of part ratings
+_axes: dict[_Category, int] = {"x": 0, "m": 1, "a": 2, "s": 3}
 
-    def _gt(left: int, right: int) -> bool:
-        return left > right
+_ALL_RATINGS = Box((range(1, 4_000 + 1),) * len(_axes))
 
-    workflow = in_workflow
-    while True:
-        action = None
-        for rule in workflow.rules:
+
+@frozen
+class _Split:
+    """Decide by the rating of one category, the axis of the ratings box."""
+
+    axis: int
+    threshold: int
+    below: _Decision
+    at_or_above: _Decision
+
+
+type _Decision = bool | _Split
+
+
+def _compile_workflows(workflows: dict[str, _Workflow]) -> _Decision:
+    """Inline all workflows into one decision tree starting at "in"."""
+    creator = DigraphCreator[str, None]()
+    for name in itertools.chain(workflows, "AR"):
+        creator.add_node(name, None)
+    for workflow in workflows.values():
+        for action in {*(rule.action for rule in workflow.rules), workflow.default}:
+            creator.add_arc(Arc(workflow.name, action))
+    graph = creator.create()
+
+    decisions: dict[str, _Decision] = {"A": True, "R": False}
+    # Every workflow is compiled after the workflows it sends parts to
+    for name in reversed(graph.topological_order()):
+        if name in decisions:
+            continue
+        workflow = workflows[name]
+        decision = decisions[workflow.default]
+        for rule in reversed(workflow.rules):
+            passed = decisions[rule.action]
             match rule.comparison:
                 case _Comparison.LT:
-                    compare = _lt
+                    decision = _Split(
+                        _axes[rule.category], rule.value, passed, decision
+                    )
                 case _Comparison.GT:
-                    compare = _gt
-
-            if compare(part[rule.category], rule.value):
-                action = rule.action
-                break
+                    decision = _Split(
+                        _axes[rule.category], rule.value + 1, decision, passed
+                    )
+        decisions[name] = decision
+    return decisions["in"]
+
+
+def _is_accepted(decision: _Decision, part: _Part) -> bool:
+    ratings = [part[category] for category in _axes]
+    while isinstance(decision, _Split):
+        if ratings[decision.axis] < decision.threshold:
+            decision = decision.below
         else:
-            action = workflow.default
-
-        assert action is not None
-
-        match action:
-            case "A":
-                return True
-            case "R":
-                return False
-            case _:
-                workflow = workflows[action]
+            decision = decision.at_or_above
+    return decision
 
 
 def p1(input_str: str) -> int:
     workflows, parts_iter = _parse_input(input_str)
-    in_workflow = workflows["in"]
+    decision = _compile_workflows(workflows)
     result = 0
     for part in parts_iter:
-        if not _process_part(in_workflow, workflows, part):
+        if not _is_accepted(decision, part):
             _logger.debug("Part %s rejected", part)
             continue
 
@@ -169,217 +193,30 @@ def p1(input_str: str) -> int:
     return result
 
 
-@define
-class _WorkflowStep:
-    category_value_ranges: dict[_Category, list[range] | None]
-    next_workflow: str
-
-
-def _merge_two_value_ranges(left: list[range], right: list[range]) -> list[range]:
-    right_iter = iter(right)
-    try:
-        r2: range | None = next(right_iter)
-    except StopIteration:
-        return []
-
-    result = list[range]()
-    for r in left:
-        assert r2 is not None
-        while r2.stop < r.start:
-            r2 = next(right_iter, None)
-            if r2 is None:
-                break
-
-        if r2 is None:
-            break
-
-        assert r2.stop >= r.start
-        if r2.start > r.stop:
-            continue
-
-        start = max(r.start, r2.start)
-        stop = min(r.stop, r2.stop)
-        assert start < stop
-        result.append(range(start, stop))
-
-        while r2.start < r.stop:
-            r2 = next(right_iter, None)
-            if r2 is None:
-                break
-
-            if r2.start > r.stop:
-                break
-
-            start = max(r.start, r2.start)
-            assert start == r2.start
-            stop = min(r.stop, r2.stop)
-            result.append(range(start, stop))
-
-    return result
-
-
-def _merge_value_range(
-    left: list[range] | None, right: list[range] | None
-) -> list[range] | None:
-    if left is None:
-        return None if right is None else list(right)
-    if right is None:
-        return list(left)
-    return _merge_two_value_ranges(left, right)
-
-
-def _merge_category_value_ranges(
-    left: Mapping[_Category, list[range] | None],
-    right: Mapping[_Category, list[range] | None],
-) -> dict[_Category, list[range] | None]:
-    return {
-        category: _merge_value_range(left[category], right[category])
-        for category in left
-    }
-
-
-def _negated_value_range(value_range: list[range] | None) -> list[range] | None:
-    if value_range is None:
-        return None
-
-    if not value_range:
-        return [range(1, 4_000 + 1)]
-
-    result = list[range]()
-    prev_stop = 1
-    for r in value_range:
-        if r.start > prev_stop:
-            result.append(range(prev_stop, r.start))
-        prev_stop = r.stop
-    if prev_stop < 4_000 + 1:
-        result.append(range(prev_stop, 4_000 + 1))
-    return result
-
-
-def _negated_category_value_ranges(
-    category_value_ranges: Mapping[_Category, list[range] | None],
-) -> dict[_Category, list[range] | None]:
-    return {
-        category: _negated_value_range(category_value_ranges[category])
-        for category in category_value_ranges
-    }
-
-
-def _category_value_ranges_from_rule(
-    rule: _Rule,
-) -> dict[_Category, list[range] | None]:
-    return {
-        category: (
-            None
-            if category != rule.category
-            else (
-                [range(1, rule.value)]
-                if rule.comparison == _Comparison.LT
-                else [range(rule.value + 1, 4_000 + 1)]
-            )
-        )
-        for category in _categories
-    }
-
-
-def _possible_category_value_ranges(
-    category_value_ranges: dict[_Category, list[range] | None],
-) -> bool:
-    return all(
-        value_ranges is None or value_ranges
-        for value_ranges in category_value_ranges.values()
-    )
-
-
-def _construct_workflow_steps(workflow: _Workflow) -> list[_WorkflowStep]:
-    result = list[_WorkflowStep]()
-    failure_limits: dict[_Category, list[range] | None] = dict.fromkeys(_categories)
-    for rule in workflow.rules:
-        category_value_ranges = _category_value_ranges_from_rule(rule)
-        applicable_category_value_ranges = _merge_category_value_ranges(
-            failure_limits, category_value_ranges
-        )
-        assert _possible_category_value_ranges(applicable_category_value_ranges)
-        result.append(_WorkflowStep(applicable_category_value_ranges, rule.action))
-        negated_category_value_ranges = _negated_category_value_ranges(
-            category_value_ranges
-        )
-        failure_limits = _merge_category_value_ranges(
-            failure_limits, negated_category_value_ranges
-        )
-
-    result.append(_WorkflowStep(failure_limits, workflow.default))
-    return result
+def _accepted_boxes(decision: _Decision) -> Iterator[Box]:
+    """Disjoint boxes of all accepted ratings, one per accepting leaf."""
+    pending = [(decision, _ALL_RATINGS)]
+    while pending:
+        decision, box = pending.pop()
+        if isinstance(decision, _Split):
+            below, at_or_above = box.split(decision.axis, decision.threshold)
+            if below:
+                pending.append((decision.below, below))
+            if at_or_above:
+                pending.append((decision.at_or_above, at_or_above))
+        elif decision:
+            yield box
 
 
 def p2(input_str: str) -> int:
     workflows, _ = _parse_input(input_str)
+    decision = _compile_workflows(workflows)
 
-    queue = Queue[_WorkflowStep]()
-    queue.put_nowait(
-        _WorkflowStep({cat: [range(1, 4_000 + 1)] for cat in _categories}, "in")
-    )
-
-    workflow_step_cache = dict[str, list[_WorkflowStep]]()
-
-    accepted_category_value_ranges = list[dict[_Category, list[range]]]()
-    while not queue.empty():
-        step = queue.get_nowait()
-        _logger.debug("Processing step: %s", step)
-        if step.next_workflow == "R":
-            _logger.debug("Rejected step")
-            continue
-        if step.next_workflow == "A":
-            _logger.debug("Accepted step")
-            assert all(
-                ranges is not None for ranges in step.category_value_ranges.values()
-            )
-            ranges = cast("dict[_Category, list[range]]", step.category_value_ranges)
-            accepted_category_value_ranges.append(ranges)
-            continue
-
-        workflow = workflows[step.next_workflow]
-        workflow_steps = workflow_step_cache.get(workflow.name)
-        if workflow_steps is None:
-            _logger.debug("Constructing workflow steps for %s", workflow)
-            workflow_steps = _construct_workflow_steps(workflow)
-            _logger.debug("Constructed workflow steps: %s", workflow_steps)
-            workflow_step_cache[workflow.name] = workflow_steps
-
-        for workflow_step in workflow_steps:
-            new_category_value_ranges = _merge_category_value_ranges(
-                step.category_value_ranges, workflow_step.category_value_ranges
-            )
-            if not _possible_category_value_ranges(new_category_value_ranges):
-                _logger.debug(
-                    "Skipping step -> workflow as ranges are impossible: %s -> %s",
-                    step,
-                    workflow_step,
-                )
-                continue
-
-            queue.put_nowait(
-                _WorkflowStep(new_category_value_ranges, workflow_step.next_workflow)
-            )
-
-    assert all(
-        ranges is not None and len(ranges) == 1
-        for cat_value_ranges in accepted_category_value_ranges
-        for ranges in cat_value_ranges.values()
-    )
-
-    if _logger.isEnabledFor(logging.DEBUG):
-        for i, cat_value_ranges in enumerate(accepted_category_value_ranges):
-            _logger.debug("i=%d, cat_value_ranges=%s", i, cat_value_ranges)
-            lenghts: dict[_Category, int] = {
-                cat: len(ranges[0]) for cat, ranges in cat_value_ranges.items()
-            }
-            _logger.debug("i=%d, range_lengths=%s", i, lenghts)
-
-    return sum(
-        math.prod(len(ranges[0]) for ranges in cat_value_ranges.values())
-        for cat_value_ranges in accepted_category_value_ranges
-    )
+    result = 0
+    for box in _accepted_boxes(decision):
+        _logger.debug("Accepted %s: volume=%d", box, box.volume)
+        result += box.volume
+    return result
 
 
 if __name__ == "__main__":
@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, Never, NewType, override
 
 from attrs import frozen
 
+from aoc.tooling.digraph import Arc, Digraph, DigraphCreator
 from aoc.tooling.run import get_logger, run
 
 if TYPE_CHECKING:
@@ -222,13 +223,10 @@ def _parse_module(
 
 
 def _find_gateway(
-    modules_with_output_names: Sequence[tuple[_AnyModule, list[_ModuleName]]],
-    receiver: _Receiver,
+    network: Digraph[_ModuleName, _AnyModule], receiver: _Receiver
 ) -> _GatewayConjuction | None:
     gateways_to_receiver = [
-        module
-        for module, outputs in modules_with_output_names
-        if receiver.name in outputs
+        network.nodes[arc.from_] for arc in network.get_arcs_to(receiver.name)
     ]
     assert len(gateways_to_receiver) <= 1, "Safety check: only 0-1 gateways are known"
     if not gateways_to_receiver:
@@ -241,6 +239,18 @@ def _find_gateway(
     return _GatewayConjuction(gateway_to_receiver.name)
 
 
+def _create_network(
+    modules_with_output_names: Sequence[tuple[_AnyModule, list[_ModuleName]]],
+) -> Digraph[_ModuleName, _AnyModule]:
+    creator = DigraphCreator[_ModuleName, _AnyModule]()
+    for module, _ in modules_with_output_names:
+        creator.add_node(module.name, module)
+    for module, outputs in modules_with_output_names:
+        for output in outputs:
+            creator.add_arc(Arc(module.name, output))
+    return creator.create()
+
+
 def _resolve_receiver_names(
     modules_with_output_names: Sequence[tuple[_AnyModule, list[_ModuleName]]],
 ) -> set[_ModuleName]:
@@ -270,19 +280,21 @@ def _parse_modules(
     if receiver_names:
         receiver = _Receiver(receiver_names.pop())
 
-    gateway: _GatewayConjuction | None = None
     if receiver:
         modules_with_output_names = [
             *modules_with_output_names,
             (receiver, list[_ModuleName]()),
         ]
-        if use_gateway:
-            gateway = _find_gateway(modules_with_output_names, receiver)
-            if gateway:
-                modules_with_output_names = [
-                    (gateway if module.name == gateway.name else module, outputs)
-                    for module, outputs in modules_with_output_names
-                ]
+    network = _create_network(modules_with_output_names)
+
+    gateway: _GatewayConjuction | None = None
+    if receiver and use_gateway:
+        gateway = _find_gateway(network, receiver)
+        if gateway:
+            modules_with_output_names = [
+                (gateway if module.name == gateway.name else module, outputs)
+                for module, outputs in modules_with_output_names
+            ]
 
     modules_by_name = {module.name: module for module, _ in modules_with_output_names}
 
@@ -294,12 +306,9 @@ def _parse_modules(
     for conjunction in modules_by_name.values():
         if not isinstance(conjunction, _Conjunction):
             continue
-        inputs = (
-            module.name
-            for module, outputs in modules_with_output_names
-            if conjunction.name in outputs
+        conjunction.set_inputs(
+            arc.from_ for arc in network.get_arcs_to(conjunction.name)
         )
-        conjunction.set_inputs(inputs)
 
     return receiver, button, gateway
 
@@ -0,0 +1,43 @@
+import pytest
+
+from aoc.tooling.bitsets import GridBitset
+
+
+def test_add_and_contains() -> None:
+    bitset = GridBitset(2, 3)
+    assert not bitset
+    bitset.add(bitset.index(1, 2))
+    bitset.update([bitset.index(0, 0), bitset.index(1, 2)])
+    assert list(bitset) == [0, 5]
+    assert len(bitset) == 2
+    assert bitset.index(0, 0) in bitset
+    assert bitset.index(0, 1) not in bitset
+    assert bitset.contains(1, 2)
+    assert not bitset.contains(0, 1)
+    with pytest.raises(IndexError):
+        bitset.index(2, 0)
+
+
+def test_union() -> None:
+    left = GridBitset(2, 2, bits=0b0011)
+    right = GridBitset(2, 2, bits=0b0110)
+    assert left | right == GridBitset(2, 2, bits=0b0111)
+    assert left.bits == 0b0011
+    left |= right
+    assert len(left) == 3
+    with pytest.raises(ValueError, match="GridBitset"):
+        left.union(GridBitset(2, 3))
+
+
+def test_layers_collapse_to_cells() -> None:
+    bitset = GridBitset(2, 2, layers=4)
+    bitset.update([bitset.index(0, 1, 3), bitset.index(0, 1, 0), bitset.index(1, 1, 2)])
+    assert len(bitset) == 3
+    assert bitset.contains(1, 1, 2)
+    assert not bitset.contains(1, 1, 0)
+    assert bitset.cells() == GridBitset(2, 2, bits=0b1010)
+
+
+def test_unhashable() -> None:
+    with pytest.raises(TypeError, match="unhashable"):
+        hash(GridBitset(1, 1))
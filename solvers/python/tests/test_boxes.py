@@ -0,0 +1,40 @@
+import itertools
+
+from aoc.tooling.boxes import Box
+
+
+def _points(box: Box) -> set[tuple[int, ...]]:
+    return set(itertools.product(*box.ranges))
+
+
+def test_volume_and_contains() -> None:
+    box = Box((range(1, 4), range(2, 4)))
+    assert box.volume == 6
+    assert (3, 2) in box
+    assert (4, 2) not in box
+    assert not Box((range(1, 4), range(2, 2)))
+
+
+def test_split() -> None:
+    box = Box((range(1, 4), range(2, 4)))
+    below, rest = box.split(0, 2)
+    assert below == Box((range(1, 2), range(2, 4)))
+    assert rest == Box((range(2, 4), range(2, 4)))
+    below, rest = box.split(1, 10)
+    assert below == box
+    assert not rest
+
+
+def test_intersection_and_difference() -> None:
+    box = Box((range(5), range(5), range(2)))
+    for other in (
+        Box((range(1, 3), range(2, 7), range(1))),
+        Box((range(6, 8), range(5), range(2))),
+        box,
+    ):
+        assert _points(box.intersection(other)) == _points(box) & _points(other)
+        pieces = box.difference(other)
+        assert sum(piece.volume for piece in pieces) == len(
+            _points(box) - _points(other)
+        )
+        assert set().union(*map(_points, pieces)) == _points(box) - _points(other)
@@ -0,0 +1,46 @@
+from typing import TYPE_CHECKING
+
+import pytest
+
+from aoc.tooling.cycles import (
+    Cycle,
+    CycleDetector,
+    find_cycle_brent,
+    find_cycle_floyd,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# 0 -> 1 -> 2 -> 3 -> 4 -> 5 -> 6 -> 2 -> ...
+_SUCCESSORS = [1, 2, 3, 4, 5, 6, 2]
+
+
+def _step(state: int) -> int:
+    return _SUCCESSORS[state]
+
+
+@pytest.mark.parametrize("find_cycle", [find_cycle_floyd, find_cycle_brent])
+def test_find_cycle(
+    find_cycle: Callable[[int, Callable[[int], int]], Cycle],
+) -> None:
+    assert find_cycle(0, _step) == Cycle(2, 5)
+    assert find_cycle(4, _step) == Cycle(0, 5)
+    assert find_cycle(3, lambda _: 3) == Cycle(0, 1)
+
+
+def test_cycle_detector() -> None:
+    detector = CycleDetector[int]()
+    state = 0
+    cycle = detector.add(state)
+    while cycle is None:
+        state = _step(state)
+        cycle = detector.add(state)
+    assert cycle == Cycle(2, 5)
+
+
+def test_index_at() -> None:
+    cycle = Cycle(2, 5)
+    assert cycle.index_at(1) == 1
+    assert cycle.index_at(7) == 2
+    assert cycle.index_at(1_000_000_000) == 5
@@ -0,0 +1,97 @@
+import pytest
+
+from aoc.tooling.digraph import Arc, Digraph, DigraphCreator, DigraphCycleError
+
+
+def test_arcs_lookup() -> None:
+    creator = DigraphCreator[str, int]()
+    for i, node_id in enumerate("abc"):
+        creator.add_node(node_id, i)
+    ab, ac, bc = Arc("a", "b"), Arc("a", "c"), Arc("b", "c")
+    for arc in (ab, ac, bc):
+        creator.add_arc(arc)
+    graph = creator.create()
+
+    assert graph.get_arcs_from("a") == [ab, ac]
+    assert graph.get_arcs_from("c") == []
+    assert graph.get_arcs_to("c") == [ac, bc]
+    assert graph.get_arcs_to("a") == []
+    assert graph.get_arcs_to("x") == []
+
+
+def test_arc_to_unknown_node() -> None:
+    creator = DigraphCreator[str, int]()
+    creator.add_node("a", 0)
+    with pytest.raises(ValueError, match="b"):
+        creator.add_arc(Arc("a", "b"))
+
+
+def _create_graph(arcs: str) -> Digraph[str, None]:
+    """Create a graph from arcs like ``"ab bc"`` over the nodes ``a`` to ``f``."""
+    creator = DigraphCreator[str, None]()
+    for node_id in "abcdef":
+        creator.add_node(node_id, None)
+    for arc in arcs.split():
+        creator.add_arc(Arc(arc[0], arc[1]))
+    return creator.create()
+
+
+def test_repr_and_eq_leave_out_arc_indexes() -> None:
+    graph = _create_graph("ab bc")
+    assert "_arcs" not in repr(graph)
+    assert graph == _create_graph("ab bc")
+    assert graph != _create_graph("ab")
+
+
+def test_topological_order() -> None:
+    order = _create_graph("ab bc ac dc ef").topological_order()
+    assert sorted(order) == list("abcdef")
+    for arc in ("ab", "bc", "ac", "dc", "ef"):
+        assert order.index(arc[0]) < order.index(arc[1])
+
+
+def test_topological_order_with_cycle() -> None:
+    with pytest.raises(DigraphCycleError):
+        _create_graph("ab bc ca").topological_order()
+
+
+def test_strongly_connected_components() -> None:
+    graph = _create_graph("ab bc ca cd de ed")
+    components = [sorted(c) for c in graph.strongly_connected_components()]
+    assert sorted(components) == [["a", "b", "c"], ["d", "e"], ["f"]]
+    assert components.index(["a", "b", "c"]) < components.index(["d", "e"])
+
+
+def test_strongly_connected_components_of_long_path() -> None:
+    creator = DigraphCreator[int, None]()
+    for i in range(10_000):
+        creator.add_node(i, None)
+    for i in range(1, 10_000):
+        creator.add_arc(Arc(i - 1, i))
+    components = creator.create().strongly_connected_components()
+    assert components == [[i] for i in range(10_000)]
+
+
+def test_condensation() -> None:
+    graph = _create_graph("ab bc ca cd de ed ad")
+    condensation = graph.condensation()
+    assert sorted(sorted(c) for c in condensation.nodes.values()) == [
+        ["a", "b", "c"],
+        ["d", "e"],
+        ["f"],
+    ]
+    assert len(condensation.arcs) == 1
+    (arc,) = condensation.arcs
+    assert sorted(condensation.nodes[arc.from_]) == ["a", "b", "c"]
+    assert sorted(condensation.nodes[arc.to]) == ["d", "e"]
+    condensation.topological_order()
+
+
+def test_reachability() -> None:
+    graph = _create_graph("ab bc cb cd")
+    reachability = graph.reachability()
+    assert reachability["a"] == 0b1111
+    assert reachability["b"] == reachability["c"] == 0b1110
+    assert reachability["d"] == 0b1000
+    assert reachability["f"] == 0b100000
+    assert graph.reachable_from("b") == {"b", "c", "d"}
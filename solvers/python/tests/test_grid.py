@@ -0,0 +1,67 @@
+import pytest
+
+from aoc.tooling.coordinates import X, Y
+from aoc.tooling.directions import RotationDirection
+from aoc.tooling.grid import Grid2d
+from aoc.tooling.map import Map2d, Map2dRectangularDataError
+
+_LINES = ["abc", "def"]
+
+
+def _lines(grid: Grid2d) -> list[str]:
+    return list(grid.str_lines())
+
+
+def test_rows_and_columns() -> None:
+    grid = Grid2d.from_lines(_LINES)
+    assert (grid.height, grid.width) == (2, 3)
+    assert grid.get(Y(1), X(0)) == ord("d")
+    assert list(grid.rows()) == [b"abc", b"def"]
+    assert list(grid.columns()) == [b"ad", b"be", b"cf"]
+    assert grid.get_or_default(Y(2), X(0)) is None
+
+
+def test_views_match_map2d() -> None:
+    grid = Grid2d.from_lines(_LINES)
+    map_ = Map2d(_LINES)
+    assert _lines(grid.transpose()) == list(map_.transpose().str_lines())
+    for direction in RotationDirection:
+        for count in range(1, 5):
+            assert _lines(grid.rotate(direction, count)) == list(
+                map_.rotate(direction, count).str_lines()
+            )
+    assert _lines(grid.flip_rows()) == ["def", "abc"]
+    assert _lines(grid.flip_columns()) == ["cba", "fed"]
+
+
+def test_views_share_buffer() -> None:
+    grid = Grid2d.from_lines(_LINES)
+    rotated = grid.rotate(RotationDirection.Clockwise)
+    rotated.set_row(Y(0), b"xy")
+    assert _lines(grid) == ["ybc", "xef"]
+    copy = rotated.copy()
+    copy.set(Y(0), X(0), ord("z"))
+    assert grid.get(Y(1), X(0)) == ord("x")
+    assert copy != rotated
+    assert copy.flip_rows().flip_rows() == copy
+
+
+def test_unhashable() -> None:
+    grid = Grid2d.from_lines(_LINES)
+    with pytest.raises(TypeError, match="unhashable"):
+        hash(grid)
+    with pytest.raises(TypeError, match="unhashable"):
+        hash(grid.transpose())
+
+
+def test_count_and_mask() -> None:
+    grid = Grid2d.from_lines(["#.#", "..#"])
+    assert grid.count(ord("#")) == 3
+    assert grid.transpose().count(ord("#")) == 3
+    assert list(grid.find_all(ord("#"))) == [(0, 0), (0, 2), (1, 2)]
+    assert list(grid.mask(b"#").rows()) == [b"\x01\x00\x01", b"\x00\x00\x01"]
+
+
+def test_not_rectangular_raises() -> None:
+    with pytest.raises(Map2dRectangularDataError):
+        Grid2d.from_lines(["ab", "c"])
@@ -0,0 +1,51 @@
+from aoc.tooling.coordinates import X, Y
+from aoc.tooling.directions import RotationDirection
+from aoc.tooling.map import IterDirection, Map2d
+
+_MAP = Map2d(["abc", "def"])
+
+
+def _lines(map_: Map2d) -> list[str]:
+    return list(map_.str_lines())
+
+
+def test_views() -> None:
+    assert _lines(_MAP.transpose()) == ["ad", "be", "cf"]
+    assert _lines(_MAP.flip_rows()) == ["def", "abc"]
+    assert _lines(_MAP.flip_columns()) == ["cba", "fed"]
+    assert _lines(_MAP.rotate(RotationDirection.Clockwise)) == ["da", "eb", "fc"]
+    assert _lines(_MAP.rotate(RotationDirection.Counterclockwise)) == [
+        "cf",
+        "be",
+        "ad",
+    ]
+    assert (
+        _MAP.rotate(RotationDirection.Clockwise, 2) == _MAP.flip_rows().flip_columns()
+    )
+    assert _MAP.rotate(RotationDirection.Counterclockwise, 4) == _MAP
+
+
+def test_view_access() -> None:
+    view = _MAP.rotate(RotationDirection.Clockwise)
+    assert (view.height, view.width) == (3, 2)
+    assert view.get(Y(0), X(1)) == "a"
+    assert view.get_or_default(Y(3), X(0)) is None
+    assert [list(row) for row in view.rows()] == [["d", "a"], ["e", "b"], ["f", "c"]]
+    assert ["".join(column) for column in view.columns()] == ["def", "abc"]
+    assert [
+        (y, [(x, sym) for x, sym in x_iter])
+        for y, x_iter in view.iter_data(Y(2), X(1), Y(1), X(0))
+    ] == [(2, [(1, "c"), (0, "f")]), (1, [(1, "b"), (0, "e")])]
+    assert [
+        (x, "".join(sym for _, sym in y_iter))
+        for x, y_iter in view.iter_data(direction=IterDirection.Columns)
+    ] == [(0, "def"), (1, "abc")]
+
+
+def test_view_equals_materialized() -> None:
+    view = _MAP.transpose().flip_rows()
+    materialized = view.materialize()
+    assert type(materialized) is Map2d
+    assert materialized == view
+    assert view == materialized
+    assert hash(view) == hash(materialized)
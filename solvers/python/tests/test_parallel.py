@@ -0,0 +1,35 @@
+import logging
+import os
+
+import pytest
+
+from aoc.tooling.parallel import ENV_SOLVER_CPUS, parallel_map
+
+_logger = logging.getLogger(__name__)
+
+
+def _square(value: int) -> int:
+    _logger.info("Squaring %d", value)
+    return value * value
+
+
+def _process_id(_value: int) -> int:
+    return os.getpid()
+
+
+@pytest.mark.parametrize("max_workers", [None, 1, 3])
+def test_results_in_item_order(max_workers: int | None) -> None:
+    assert parallel_map(_square, range(50), max_workers=max_workers) == [
+        value * value for value in range(50)
+    ]
+
+
+def test_worker_logs_reach_solver_loggers(caplog: pytest.LogCaptureFixture) -> None:
+    with caplog.at_level(logging.INFO):
+        parallel_map(_square, range(4), max_workers=2, chunk_size=1)
+    assert sorted(caplog.messages) == [f"Squaring {value}" for value in range(4)]
+
+
+def test_solver_cpus_limit_workers(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(ENV_SOLVER_CPUS, "1")
+    assert set(parallel_map(_process_id, range(8))) == {os.getpid()}
@@ -0,0 +1,53 @@
+import pstats
+import re
+import sys
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from aoc.tooling.profile import Profiler, call_profiled
+
+if TYPE_CHECKING:
+    import pathlib
+
+
+def _busy(seconds: float) -> str:
+    # Long enough for the sampler to catch the function several times
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(100))
+    return "done"
+
+
+def test_cprofile(tmp_path: pathlib.Path) -> None:
+    result, output_path = call_profiled(
+        Profiler.CProfile, _busy, 0.01, tmp_path / "profiles" / "busy"
+    )
+    assert result == "done"
+    assert output_path == tmp_path / "profiles" / "busy.pstats"
+    stats = pstats.Stats(str(output_path))
+    assert "_busy" in stats.get_stats_profile().func_profiles
+
+
+def test_sample(tmp_path: pathlib.Path) -> None:
+    switch_interval = sys.getswitchinterval()
+    result, output_path = call_profiled(Profiler.Sample, _busy, 0.2, tmp_path / "busy")
+    assert result == "done"
+    assert output_path == tmp_path / "busy.collapsed"
+    assert sys.getswitchinterval() == switch_interval
+    lines = output_path.read_text().splitlines()
+    assert lines
+    assert all(re.fullmatch(r"[^ ]+(;[^ ]+)* \d+", line) for line in lines)
+    assert any("test_profile.py:_busy" in line for line in lines)
+
+
+def test_sample_restores_switch_interval_on_error(tmp_path: pathlib.Path) -> None:
+    def fail(_: None) -> None:
+        raise ValueError
+
+    switch_interval = sys.getswitchinterval()
+    with pytest.raises(ValueError):  # noqa: PT011 - raised by fail itself
+        call_profiled(Profiler.Sample, fail, None, tmp_path / "fail")
+    assert sys.getswitchinterval() == switch_interval
@@ -0,0 +1,56 @@
+import pytest
+
+from aoc.tooling.ranges import IntervalSet
+
+
+def test_normalized() -> None:
+    intervals = IntervalSet([range(5, 8), range(2), range(2, 3), range(7, 9)])
+    assert list(intervals.ranges()) == [range(3), range(5, 9)]
+    assert intervals.total_length == 7
+    assert (intervals.min, intervals.max) == (0, 8)
+    assert not IntervalSet([range(3, 3)])
+
+
+def test_queries() -> None:
+    intervals = IntervalSet([range(3), range(5, 9)])
+    assert [v for v in range(-1, 10) if v in intervals] == [0, 1, 2, 5, 6, 7, 8]
+    assert intervals.overlaps(range(2, 5))
+    assert intervals.overlaps(range(8, 20))
+    assert not intervals.overlaps(range(3, 5))
+    assert not intervals.overlaps(range(9, 20))
+    assert not intervals.overlaps(range(-5, 0))
+
+
+@pytest.mark.parametrize(
+    ("left", "right"),
+    [
+        ([range(3), range(5, 9)], [range(2, 6), range(8, 12)]),
+        ([range(10)], [range(2, 3), range(4, 5)]),
+        ([], [range(1, 2)]),
+        ([range(3), range(6, 8)], [range(3, 6)]),
+    ],
+)
+def test_set_operations(left: list[range], right: list[range]) -> None:
+    # Compared to the same operations on sets of all values
+    left_values = {v for r in left for v in r}
+    right_values = {v for r in right for v in r}
+
+    def values(intervals: IntervalSet) -> set[int]:
+        return {v for r in intervals.ranges() for v in r}
+
+    left_set, right_set = IntervalSet(left), IntervalSet(right)
+    assert values(left_set | right_set) == left_values | right_values
+    assert left_set | right_set == IntervalSet(left + right)
+    assert values(left_set & right_set) == left_values & right_values
+    assert values(left_set - right_set) == left_values - right_values
+    assert values(right_set - left_set) == right_values - left_values
+    assert values(left_set.complement(range(-1, 7))) == set(range(-1, 7)) - left_values
+    assert values(left_set.clipped(range(1, 6))) == left_values & set(range(1, 6))
+    assert values(left_set.shifted(10)) == {v + 10 for v in left_values}
+
+
+def test_clipped_to_empty_bounds() -> None:
+    intervals = IntervalSet([range(10)])
+    assert not intervals.clipped(range(5, 1))
+    assert not intervals.clipped(range(5, 5))
+    assert intervals.complement(range(5, 1)) == IntervalSet()
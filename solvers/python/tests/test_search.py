@@ -0,0 +1,66 @@
+import pytest
+
+from aoc.tooling import search
+
+# 0 --1-- 1 --1-- 2
+# |               |
+# 5               1
+# |               |
+# 3 ------1------ 4      5 is isolated
+_ARCS = {
+    0: [(1, 1), (3, 5)],
+    1: [(0, 1), (2, 1)],
+    2: [(1, 1), (4, 1)],
+    3: [(0, 5), (4, 1)],
+    4: [(2, 1), (3, 1)],
+    5: [],
+}
+
+
+def _weighted(state: int) -> list[tuple[int, int]]:
+    return _ARCS[state]
+
+
+def _unweighted(state: int) -> list[int]:
+    return [next_state for next_state, _ in _ARCS[state]]
+
+
+def test_bfs() -> None:
+    result = search.bfs([0], _unweighted, len(_ARCS))
+    assert result.distances == [0, 1, 2, 1, 2, search.UNREACHED]
+    assert result.goal is None
+    assert result.distance_to(5) is None
+
+
+def test_bfs_goal() -> None:
+    result = search.bfs([0], _unweighted, len(_ARCS), goals={4})
+    assert result.goal == 4
+    assert result.goal_distance == 2
+
+
+@pytest.mark.parametrize("max_weight", [None, 5])
+def test_dijkstra(max_weight: int | None) -> None:
+    result = search.dijkstra([0], _weighted, len(_ARCS), max_weight=max_weight)
+    assert result.distances == [0, 1, 2, 4, 3, search.UNREACHED]
+    assert result.visited == 5
+
+
+@pytest.mark.parametrize("max_weight", [None, 5])
+def test_dijkstra_goal(max_weight: int | None) -> None:
+    result = search.dijkstra(
+        [0, 5], _weighted, len(_ARCS), goals={3}, max_weight=max_weight
+    )
+    assert result.goal == 3
+    assert result.goal_distance == 4
+
+
+def test_dijkstra_max_weight_exceeded() -> None:
+    with pytest.raises(search.MaxWeightExceededError):
+        search.dijkstra([0], _weighted, len(_ARCS), max_weight=4)
+
+
+def test_a_star() -> None:
+    # Never overestimates the distance to 3
+    estimates = [3, 3, 2, 0, 1, 0]
+    result = search.a_star([0], _weighted, len(_ARCS), estimates.__getitem__, goals={3})
+    assert result.goal_distance == 4
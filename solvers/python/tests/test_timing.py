@@ -0,0 +1,30 @@
+from aoc.tooling import timing
+
+
+def test_nothing_recorded_outside_recording() -> None:
+    with timing.phase("parse"):
+        timing.count("nodes")
+    with timing.recording() as timings:
+        pass
+    assert timings.durations == {}
+    assert timings.counters == {}
+
+
+def test_phases_and_counters() -> None:
+    @timing.timed("step")
+    def step() -> int:
+        timing.count("steps")
+        return 1
+
+    with timing.recording() as timings:
+        with timing.phase("parse"):
+            timing.count("lines", 3)
+        with timing.phase("solve"):
+            assert step() + step() == 2
+        with timing.phase("solve"):
+            pass
+
+    assert list(timings.durations) == ["parse", "solve/step", "solve"]
+    assert timings.durations["solve"] >= timings.durations["solve/step"]
+    assert timings.counters == {"lines": 3, "steps": 2}
+    assert timings.to_line().startswith(timing.PHASES_LINE_PREFIX)